@@ -1,3 +1,5 @@
+import asyncio
+import base64
 import logging
 from datetime import UTC, datetime
 from typing import Annotated
@@ -10,6 +12,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
 from app.database import get_db
+from app.models.item import ClothingItem
 from app.models.user import User
 from app.schemas.item import (
     ArchiveRequest,
@@ -41,6 +44,22 @@ settings = get_settings()
 router = APIRouter(prefix="/items", tags=["Items"])
 
 
+def _encode_cursor(item: ClothingItem) -> str:
+    """Encode an item's (created_at, id) sort key as an opaque page cursor."""
+    return base64.urlsafe_b64encode(f"{item.created_at.isoformat()}|{item.id}".encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        created_at, item_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), UUID(item_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        ) from None
+
+
 @router.get("", response_model=ItemListResponse)
 async def list_items(
     db: Annotated[AsyncSession, Depends(get_db)],
@@ -57,6 +76,7 @@ async def list_items(
     search: str | None = None,
     sort_by: str | None = None,
     sort_order: str = "desc",
+    cursor: str | None = None,
 ) -> ItemListResponse:
     color_list = colors.split(",") if colors else None
 
@@ -73,20 +93,40 @@ async def list_items(
         sort_order=sort_order,
     )
 
+    # Cursors are (created_at, id) keys, so they only apply to the default sort
+    seekable = sort_by in (None, "created_at")
+    if cursor and not seekable:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="cursor can only be used when sorting by created_at",
+        )
+
     item_service = ItemService(db)
-    items, total = await item_service.get_list(
-        user_id=current_user.id,
-        filters=filters,
-        page=page,
-        page_size=page_size,
-    )
+    total: int | None
+    if cursor:
+        items, has_more = await item_service.get_list_after(
+            user_id=current_user.id,
+            filters=filters,
+            cursor=_decode_cursor(cursor),
+            page_size=page_size,
+        )
+        total = None
+    else:
+        items, total = await item_service.get_list(
+            user_id=current_user.id,
+            filters=filters,
+            page=page,
+            page_size=page_size,
+        )
+        has_more = (page * page_size) < total
 
     return ItemListResponse(
         items=[ItemResponse.model_validate(item) for item in items],
         total=total,
         page=page,
         page_size=page_size,
-        has_more=(page * page_size) < total,
+        has_more=has_more,
+        next_cursor=_encode_cursor(items[-1]) if has_more and seekable and items else None,
     )
 
 
@@ -108,7 +148,9 @@ async def create_item(
     image_service = ImageService()
     item_service = ItemService(db)
 
-    content = await image.read()
+    # The upload is already spooled to a temp file; stream from it rather than
+    # reading the whole body into memory
+    content = image.file
     content_type = image.content_type or "application/octet-stream"
 
     if not image_service.validate_image(content, content_type):
@@ -136,7 +178,7 @@ async def create_item(
     try:
         image_paths = await image_service.process_and_store(
             user_id=current_user.id,
-            image_data=content,
+            image_file=content,
             original_filename=image.filename or "upload.jpg",
         )
     except ValueError as e:
@@ -223,8 +265,8 @@ async def bulk_create_items(
             filename = upload_file.filename or "unknown.jpg"
 
             try:
-                # Read and validate image
-                content = await upload_file.read()
+                # Validate image (streamed from the spooled upload)
+                content = upload_file.file
                 content_type = upload_file.content_type or "application/octet-stream"
 
                 if not image_service.validate_image(content, content_type):
@@ -241,10 +283,7 @@ async def bulk_create_items(
                 # Check for duplicates BEFORE storing
                 try:
                     image_hash = image_service.compute_phash(content, filename)
-                    existing = await item_service.find_duplicate_by_hash(
-                        current_user.id, image_hash
-                    )
-                    if existing:
+                    if await item_service.duplicate_exists(current_user.id, image_hash):
                         results.append(
                             BulkUploadResult(
                                 filename=filename,
@@ -261,7 +300,7 @@ async def bulk_create_items(
                 # Process and store image
                 image_paths = await image_service.process_and_store(
                     user_id=current_user.id,
-                    image_data=content,
+                    image_file=content,
                     original_filename=filename,
                 )
 
@@ -364,7 +403,7 @@ async def bulk_delete_items(
                 continue
 
             # Delete images
-            image_service.delete_images(
+            await image_service.delete_images(
                 {
                     "image_path": item.image_path,
                     "medium_path": item.medium_path,
@@ -539,7 +578,7 @@ async def delete_item(
 
     # Delete images
     image_service = ImageService()
-    image_service.delete_images(
+    await image_service.delete_images(
         {
             "image_path": item.image_path,
             "medium_path": item.medium_path,
@@ -558,7 +597,7 @@ async def archive_item(
     current_user: Annotated[User, Depends(get_current_user)],
 ) -> ItemResponse:
     item_service = ItemService(db)
-    item = await item_service.get_by_id(item_id, current_user.id)
+    item = await item_service.archive_by_id(item_id, current_user.id, request.reason)
 
     if not item:
         raise HTTPException(
@@ -566,7 +605,6 @@ async def archive_item(
             detail="Item not found",
         )
 
-    item = await item_service.archive(item, request.reason)
     return ItemResponse.model_validate(item)
 
 
@@ -577,7 +615,7 @@ async def restore_item(
     current_user: Annotated[User, Depends(get_current_user)],
 ) -> ItemResponse:
     item_service = ItemService(db)
-    item = await item_service.get_by_id(item_id, current_user.id)
+    item = await item_service.restore_by_id(item_id, current_user.id)
 
     if not item:
         raise HTTPException(
@@ -585,7 +623,6 @@ async def restore_item(
             detail="Item not found",
         )
 
-    item = await item_service.restore(item)
     return ItemResponse.model_validate(item)
 
 
@@ -622,8 +659,6 @@ async def log_item_wear(
         notes=request.notes,
     )
 
-    # Refresh to get updated wear_count
-    await db.refresh(item)
     return ItemResponse.model_validate(item)
 
 
@@ -751,7 +786,6 @@ async def log_item_wash(
         notes=request.notes,
     )
 
-    await db.refresh(item)
     return ItemResponse.model_validate(item)
 
 
@@ -846,9 +880,9 @@ async def rotate_item_image(
 
     try:
         image_service = ImageService()
-        image_service.rotate_image(item.image_path, direction)
+        # jpegtran and Pillow both block; keep them off the event loop
+        await asyncio.to_thread(image_service.rotate_image, item.image_path, direction)
         await db.commit()
-        await db.refresh(item)
         return ItemResponse.model_validate(item)
     except ValueError as e:
         raise HTTPException(
@@ -896,7 +930,7 @@ async def add_item_image(
 
     # Process image
     image_service_inst = ImageService()
-    content = await image.read()
+    content = image.file
     content_type = image.content_type or "application/octet-stream"
 
     if not image_service_inst.validate_image(content, content_type):
@@ -908,7 +942,7 @@ async def add_item_image(
     try:
         image_paths = await image_service_inst.process_and_store(
             user_id=current_user.id,
-            image_data=content,
+            image_file=content,
             original_filename=image.filename or "upload.jpg",
         )
     except ValueError as e:
@@ -926,7 +960,6 @@ async def add_item_image(
     )
     db.add(item_image)
     await db.flush()
-    await db.refresh(item_image)
 
     return ItemImageResponse.model_validate(item_image)
 
@@ -964,7 +997,7 @@ async def delete_item_image(
 
     # Delete image files
     image_service_inst = ImageService()
-    image_service_inst.delete_images(
+    await image_service_inst.delete_images(
         {
             "image_path": item_image.image_path,
             "medium_path": item_image.medium_path,
@@ -231,13 +231,13 @@ async def get_learning_insights(
     active_insights = await learning_service.get_active_insights(current_user.id)
     insights = [
         InsightResponse(
-            id=insight.id,
-            category=insight.category,
-            insight_type=insight.insight_type,
-            title=insight.title,
-            description=insight.description,
-            confidence=float(insight.confidence),
-            created_at=insight.created_at,
+            id=insight["id"],
+            category=insight["category"],
+            insight_type=insight["insight_type"],
+            title=insight["title"],
+            description=insight["description"],
+            confidence=float(insight["confidence"]),
+            created_at=insight["created_at"],
         )
         for insight in active_insights
     ]
@@ -4,7 +4,8 @@ from zoneinfo import ZoneInfo
 
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, ValidationError
-from sqlalchemy import and_, select
+from sqlalchemy import and_, func, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
@@ -248,32 +249,28 @@ async def register_push_token(
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid push token format") from None
 
-    # Check if expo_push channel already exists
-    existing = await db.execute(
-        select(NotificationSettings).where(
-            and_(
-                NotificationSettings.user_id == current_user.id,
-                NotificationSettings.channel == "expo_push",
-            )
-        )
+    # Upsert on the (user_id, channel) unique constraint; RETURNING hands back the
+    # stored row, so no lookup beforehand or refresh afterwards is needed
+    stmt = insert(NotificationSettings).values(
+        user_id=current_user.id,
+        channel="expo_push",
+        enabled=True,
+        priority=0,  # Highest priority - push notifications preferred
+        config={"push_token": data.push_token},
     )
-    setting = existing.scalar_one_or_none()
-
-    if setting:
-        setting.config = {"push_token": data.push_token}
-        setting.enabled = True
-    else:
-        setting = NotificationSettings(
-            user_id=current_user.id,
-            channel="expo_push",
-            enabled=True,
-            priority=0,  # Highest priority - push notifications preferred
-            config={"push_token": data.push_token},
-        )
-        db.add(setting)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "channel"],
+        set_={
+            "config": stmt.excluded.config,
+            "enabled": True,
+            "updated_at": func.now(),
+        },
+    ).returning(NotificationSettings)
+    # An upsert's RETURNING doesn't refresh a setting already loaded in this session
+    result = await db.execute(stmt.execution_options(populate_existing=True))
+    setting = result.scalar_one()
 
     await db.commit()
-    await db.refresh(setting)
     return setting
 
 
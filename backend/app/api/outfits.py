@@ -526,7 +526,10 @@ async def accept_outfit(
     outfit.status = OutfitStatus.accepted
     outfit.responded_at = datetime.utcnow()
     await db.commit()
-    await db.refresh(outfit)
+    # refresh() would leave the eager-loaded relationships to lazy-load, which
+    # fails under asyncio; reload the row together with them instead
+    result = await db.execute(query.execution_options(populate_existing=True))
+    outfit = result.scalar_one()
 
     return outfit_to_response(outfit, await fetch_wore_instead_items_map(db, [outfit]))
 
@@ -559,7 +562,10 @@ async def reject_outfit(
     outfit.status = OutfitStatus.rejected
     outfit.responded_at = datetime.utcnow()
     await db.commit()
-    await db.refresh(outfit)
+    # refresh() would leave the eager-loaded relationships to lazy-load, which
+    # fails under asyncio; reload the row together with them instead
+    result = await db.execute(query.execution_options(populate_existing=True))
+    outfit = result.scalar_one()
 
     return outfit_to_response(outfit, await fetch_wore_instead_items_map(db, [outfit]))
 
@@ -610,6 +616,9 @@ async def submit_feedback(
             detail="Outfit not found",
         )
 
+    # An outfit accepted or rejected before now may already be in the learning totals
+    previously_responded_at = outfit.responded_at
+
     # Create or update feedback
     if outfit.feedback:
         feedback = outfit.feedback
@@ -701,7 +710,7 @@ async def submit_feedback(
     # Trigger learning system to process this feedback
     try:
         learning_service = LearningService(db)
-        await learning_service.process_feedback(outfit_id, current_user.id)
+        await learning_service.process_feedback(outfit_id, current_user.id, previously_responded_at)
         logger.info(f"Learning processed for outfit {outfit_id}")
     except Exception as e:
         # Don't fail the request if learning fails - log full traceback
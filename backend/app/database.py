@@ -16,6 +16,12 @@ engine = create_async_engine(
     pool_pre_ping=True,
     pool_size=5,
     max_overflow=10,
+    connect_args={
+        # SQLAlchemy's per-connection cache of asyncpg prepared statements, and
+        # asyncpg's own statement cache underneath it
+        "prepared_statement_cache_size": settings.database_statement_cache_size,
+        "statement_cache_size": settings.database_statement_cache_size,
+    },
 )
 
 # Create session factory
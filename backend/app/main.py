@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
@@ -12,6 +13,7 @@ from pydantic import ValidationError
 from app.api.router import api_router
 from app.config import get_settings
 from app.database import engine
+from app.services.notification_providers import close_provider_clients, open_provider_clients
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
@@ -23,7 +25,14 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     if warning:
         logger.error("Configuration: %s", warning)
     logger.info("Auth mode: %s", settings.get_auth_mode())
+    if settings.debug:
+        # Log callbacks that hold the event loop long enough to stall other requests
+        loop = asyncio.get_running_loop()
+        loop.set_debug(True)
+        loop.slow_callback_duration = 0.05
+    await open_provider_clients()
     yield
+    await close_provider_clients()
     await engine.dispose()
 
 
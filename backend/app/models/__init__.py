@@ -1,7 +1,16 @@
 from app.models.family import Family, FamilyInvite
-from app.models.item import ClothingItem, ItemHistory, ItemImage, WashHistory
+from app.models.item import (
+    ClothingItem,
+    ItemColorCount,
+    ItemHistory,
+    ItemImage,
+    ItemTypeCount,
+    WashHistory,
+)
 from app.models.learning import (
+    ItemPairOccasionStat,
     ItemPairScore,
+    ItemPairWeatherStat,
     OutfitPerformance,
     StyleInsight,
     UserLearningProfile,
@@ -19,6 +28,8 @@ __all__ = [
     "UserPreference",
     "UserLearningProfile",
     "ItemPairScore",
+    "ItemPairOccasionStat",
+    "ItemPairWeatherStat",
     "OutfitPerformance",
     "StyleInsight",
     "NotificationSettings",
@@ -26,6 +37,8 @@ __all__ = [
     "ClothingItem",
     "ItemHistory",
     "ItemImage",
+    "ItemTypeCount",
+    "ItemColorCount",
     "WashHistory",
     "FamilyOutfitRating",
     "Outfit",
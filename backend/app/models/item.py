@@ -5,6 +5,8 @@ from decimal import Decimal
 from typing import TYPE_CHECKING, Optional
 
 from sqlalchemy import (
+    DDL,
+    BigInteger,
     Boolean,
     Date,
     DateTime,
@@ -14,6 +16,7 @@ from sqlalchemy import (
     Numeric,
     String,
     Text,
+    event,
     func,
 )
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID
@@ -45,7 +48,7 @@ class ClothingItem(Base):
     image_path: Mapped[str] = mapped_column(String(500), nullable=False)
     thumbnail_path: Mapped[str | None] = mapped_column(String(500))
     medium_path: Mapped[str | None] = mapped_column(String(500))
-    image_hash: Mapped[str | None] = mapped_column(String(16), index=True)  # pHash hex string
+    image_hash: Mapped[int | None] = mapped_column(BigInteger, index=True)  # 64-bit pHash
 
     # Classification
     type: Mapped[str] = mapped_column(String(50), nullable=False)
@@ -176,3 +179,69 @@ class ItemImage(Base):
 
     # Relationships
     item: Mapped["ClothingItem"] = relationship("ClothingItem", back_populates="additional_images")
+
+
+class ItemTypeCount(Base):
+    """Non-archived item count per type, maintained by a trigger on clothing_items."""
+
+    __tablename__ = "item_type_counts"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    type: Mapped[str] = mapped_column(String(50), primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class ItemColorCount(Base):
+    """Non-archived item count per color, maintained by a trigger on clothing_items."""
+
+    __tablename__ = "item_color_counts"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    color: Mapped[str] = mapped_column(String, primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+# Keeps item_type_counts / item_color_counts in step with clothing_items, so the
+# wardrobe stats read a few pre-aggregated rows instead of grouping every item.
+# Mirrors the add_item_count_tables migration for databases built by create_all.
+ITEM_COUNTS_FUNCTION = DDL("""
+CREATE OR REPLACE FUNCTION update_item_counts() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND NOT OLD.is_archived THEN
+        UPDATE item_type_counts SET count = count - 1
+        WHERE user_id = OLD.user_id AND type = OLD.type;
+        UPDATE item_color_counts AS c SET count = c.count - old_colors.n
+        FROM (
+            SELECT color, count(*) AS n FROM unnest(OLD.colors) AS color
+            WHERE color IS NOT NULL GROUP BY color
+        ) AS old_colors
+        WHERE c.user_id = OLD.user_id AND c.color = old_colors.color;
+        DELETE FROM item_type_counts WHERE user_id = OLD.user_id AND count <= 0;
+        DELETE FROM item_color_counts WHERE user_id = OLD.user_id AND count <= 0;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NOT NEW.is_archived THEN
+        INSERT INTO item_type_counts (user_id, type, count)
+        VALUES (NEW.user_id, NEW.type, 1)
+        ON CONFLICT (user_id, type) DO UPDATE SET count = item_type_counts.count + 1;
+        INSERT INTO item_color_counts (user_id, color, count)
+        SELECT NEW.user_id, color, count(*) FROM unnest(NEW.colors) AS color
+        WHERE color IS NOT NULL GROUP BY color
+        ON CONFLICT (user_id, color)
+        DO UPDATE SET count = item_color_counts.count + EXCLUDED.count;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+""")
+ITEM_COUNTS_TRIGGER = DDL("""
+CREATE OR REPLACE TRIGGER clothing_items_update_counts
+AFTER INSERT OR DELETE OR UPDATE OF user_id, type, colors, is_archived ON clothing_items
+FOR EACH ROW EXECUTE FUNCTION update_item_counts()
+""")
+
+event.listen(Base.metadata, "after_create", ITEM_COUNTS_FUNCTION.execute_if(dialect="postgresql"))
+event.listen(Base.metadata, "after_create", ITEM_COUNTS_TRIGGER.execute_if(dialect="postgresql"))
@@ -8,6 +8,7 @@ from typing import TYPE_CHECKING
 from sqlalchemy import (
     DateTime,
     ForeignKey,
+    ForeignKeyConstraint,
     Integer,
     Numeric,
     String,
@@ -62,6 +63,11 @@ class UserLearningProfile(Base):
     # Format: {"friday": {"occasion_override": "casual"}, "monday": {"formality": "formal"}}
     learned_temporal_patterns: Mapped[dict] = mapped_column(JSONB, default=dict)
 
+    # Running sums and counts the learned scores above are derived from, so new
+    # feedback can be added without recomputing from the whole outfit history
+    # Format: {"outfits": 12, "accepted": 9, "colors": {"blue": {"sum": 2.4, "count": 6}}, ...}
+    learning_totals: Mapped[dict] = mapped_column(JSONB, default=dict)
+
     # Overall recommendation acceptance rate (0-1)
     overall_acceptance_rate: Mapped[Decimal | None] = mapped_column(Numeric(5, 4))
 
@@ -130,10 +136,6 @@ class ItemPairScore(Base):
     total_rating_sum: Mapped[int] = mapped_column(Integer, default=0)
     rating_count: Mapped[int] = mapped_column(Integer, default=0)
 
-    # Context tracking (which occasions/weather this pair works well in)
-    occasion_performance: Mapped[dict] = mapped_column(JSONB, default=dict)
-    weather_performance: Mapped[dict] = mapped_column(JSONB, default=dict)
-
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
@@ -150,6 +152,49 @@ class ItemPairScore(Base):
     item2: Mapped["ClothingItem"] = relationship("ClothingItem", foreign_keys=[item2_id])
 
 
+class ItemPairOccasionStat(Base):
+    """How often an item pair was worn for an occasion, and how often positively."""
+
+    __tablename__ = "item_pair_occasion_stats"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    item1_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    item2_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    occasion: Mapped[str] = mapped_column(String(50), primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    positive: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["user_id", "item1_id", "item2_id"],
+            ["item_pair_scores.user_id", "item_pair_scores.item1_id", "item_pair_scores.item2_id"],
+            ondelete="CASCADE",
+        ),
+    )
+
+
+class ItemPairWeatherStat(Base):
+    """How often an item pair was worn in a temperature bucket, and how often positively."""
+
+    __tablename__ = "item_pair_weather_stats"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    item1_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    item2_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    # cold, cool, mild or hot; see LearningService._get_temp_bucket
+    temp_bucket: Mapped[str] = mapped_column(String(10), primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    positive: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["user_id", "item1_id", "item2_id"],
+            ["item_pair_scores.user_id", "item_pair_scores.item1_id", "item_pair_scores.item2_id"],
+            ondelete="CASCADE",
+        ),
+    )
+
+
 class OutfitPerformance(Base):
     """
     Tracks outfit performance metrics for learning.
@@ -181,6 +226,9 @@ class OutfitPerformance(Base):
     rating_score: Mapped[Decimal | None] = mapped_column(Numeric(5, 4))
     wear_score: Mapped[Decimal | None] = mapped_column(Numeric(5, 4))
 
+    # Signed feedback signal (-1 to 1) used for learning; see LearningService._get_outfit_signal
+    signal: Mapped[Decimal | None] = mapped_column(Numeric(4, 3))
+
     # Context at time of recommendation (denormalized for analysis)
     occasion: Mapped[str] = mapped_column(String(50))
     weather_temp: Mapped[int | None] = mapped_column(Integer)
@@ -198,6 +246,9 @@ class OutfitPerformance(Base):
     was_modified: Mapped[bool] = mapped_column(default=False)
     modification_notes: Mapped[str | None] = mapped_column(Text)
 
+    # Fingerprint of the feedback last processed, so replays can be skipped
+    feedback_hash: Mapped[str | None] = mapped_column(String(32))
+
     computed_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
@@ -3,7 +3,17 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Integer, String, Text, func
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+    func,
+)
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -43,7 +53,9 @@ class NotificationSettings(Base):
     user: Mapped["User"] = relationship("User", back_populates="notification_settings")
 
     __table_args__ = (
-        # Unique constraint on user + channel
+        # Unique constraint on user + channel (named as Postgres named it in the
+        # initial schema)
+        UniqueConstraint("user_id", "channel", name="notification_settings_user_id_channel_key"),
         {"sqlite_autoincrement": True},
     )
 
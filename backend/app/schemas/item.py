@@ -136,10 +136,11 @@ class ItemResponse(ItemBase):
 
 class ItemListResponse(BaseModel):
     items: list[ItemResponse]
-    total: int
+    total: int | None  # Not counted for cursor requests
     page: int
     page_size: int
     has_more: bool
+    next_cursor: str | None = None  # Pass as ?cursor= to seek to the next page
 
 
 class ItemFilter(BaseModel):
@@ -1,13 +1,33 @@
+import asyncio
+import logging
+import os
+import shutil
+import subprocess
 import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import datetime
-from io import BytesIO
+from functools import lru_cache
 from pathlib import Path
+from typing import BinaryIO
 
-import imagehash
+import numpy as np
 from PIL import Image
+from scipy.fft import dct
 
 from app.config import get_settings
 
+try:
+    from turbojpeg import TJCS_CMYK, TJCS_YCCK, TJPF_RGB, TJSAMP_420, TJSAMP_422, TurboJPEG
+except ImportError:
+    TurboJPEG = None
+
+try:
+    import pyvips
+except (ImportError, OSError):
+    pyvips = None
+
+logger = logging.getLogger(__name__)
 settings = get_settings()
 
 # Image size configurations
@@ -29,6 +49,114 @@ ALLOWED_MIME_TYPES = {
     "image/heif",
 }
 
+# Largest JPEG decoded with libjpeg-turbo, which needs the whole file as bytes.
+# Below this the compressed copy is small next to the decoded bitmap
+TURBO_DECODE_MAX_BYTES = 4 * 1024 * 1024
+
+# Leading byte signatures for the accepted formats
+JPEG_MAGIC = b"\xff\xd8\xff"
+PNG_MAGIC = b"\x89PNG\r\n\x1a\n"
+HEIF_BRANDS = {b"heic", b"heix", b"heim", b"heis", b"hevc", b"hevx", b"mif1", b"msf1"}
+
+
+@lru_cache
+def _get_turbojpeg() -> "TurboJPEG | None":
+    """Return a shared libjpeg-turbo handle, or None if it is unavailable."""
+    if TurboJPEG is None:
+        return None
+    try:
+        return TurboJPEG()
+    except (OSError, RuntimeError) as e:
+        logger.info(f"libjpeg-turbo not available, using Pillow for JPEG coding: {e}")
+        return None
+
+
+@lru_cache(maxsize=1)
+def _get_jpegtran() -> str | None:
+    """Locate the jpegtran binary used for lossless rotation, if installed."""
+    return shutil.which("jpegtran")
+
+
+@contextmanager
+def _atomic_path(path: Path) -> Iterator[Path]:
+    """
+    Yield a temporary sibling of path and rename it over path on success.
+
+    Readers never see a half-written image, which matters when rotate_image
+    overwrites files that are being served.
+    """
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """Atomically write data to path, preallocating the file as one extent."""
+    with _atomic_path(path) as tmp_path:
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            if data and hasattr(os, "posix_fallocate"):
+                try:
+                    os.posix_fallocate(fd, 0, len(data))
+                except OSError:
+                    pass  # Filesystem doesn't support preallocation
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view) :]
+        finally:
+            os.close(fd)
+
+
+def _has_image_signature(header: bytes) -> bool:
+    """Check the first 12 bytes of a file against the allowed image formats."""
+    return (
+        header.startswith((JPEG_MAGIC, PNG_MAGIC))
+        or (header[:4] == b"RIFF" and header[8:12] == b"WEBP")
+        or (header[4:8] == b"ftyp" and header[8:12] in HEIF_BRANDS)
+    )
+
+
+def _flatten_to_rgb(image: Image.Image) -> Image.Image:
+    """
+    Convert an image to RGB, compositing any transparency over white.
+
+    The blend runs as whole-array numpy arithmetic rather than Image.paste with
+    an alpha mask, which is a scalar per-pixel loop on stock Pillow.
+    """
+    if image.mode in ("RGBA", "LA", "P"):
+        if image.mode == "P" and "transparency" not in image.info:
+            return image.convert("RGB")
+        rgba = np.asarray(image.convert("RGBA"), dtype=np.uint16)
+        alpha = rgba[..., 3:4]
+        rgb = (rgba[..., :3] * alpha + 255 * (255 - alpha)) // 255
+        return Image.fromarray(rgb.astype(np.uint8), "RGB")
+    if image.mode != "RGB":
+        return image.convert("RGB")
+    return image
+
+
+def _phash(image: Image.Image) -> str:
+    """
+    Compute a 64-bit perceptual hash as a 16-character hex string.
+
+    Same algorithm and output as ``imagehash.phash`` (32x32 grayscale, 2D DCT,
+    8x8 low-frequency block thresholded at its median), so stored hashes stay
+    comparable, but without building an ImageHash and its bit string.
+    """
+    # Convert to RGB if needed for consistent hashing
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    pixels = np.asarray(
+        image.convert("L").resize((32, 32), Image.Resampling.LANCZOS), dtype=np.float64
+    )
+    low_freq = dct(dct(pixels, axis=0), axis=1)[:8, :8]
+    bits = low_freq > np.median(low_freq)
+    return np.packbits(bits).tobytes().hex()
+
 
 class ImageService:
     def __init__(self, storage_path: str | None = None):
@@ -46,7 +174,7 @@ class ImageService:
         unique_id = uuid.uuid4().hex[:8]
         return f"{timestamp}_{unique_id}{extension}"
 
-    def _convert_heic(self, image_data: bytes) -> Image.Image:
+    def _convert_heic(self, image_file: BinaryIO) -> Image.Image:
         """Convert HEIC/HEIF to PIL Image."""
         try:
             from pillow_heif import register_heif_opener
@@ -55,42 +183,121 @@ class ImageService:
         except ImportError:
             pass
 
-        return Image.open(BytesIO(image_data))
+        return Image.open(image_file)
+
+    def _decode_jpeg(self, tj: "TurboJPEG", image_file: BinaryIO) -> Image.Image:
+        """
+        Decode a JPEG to RGB with libjpeg-turbo, falling back to Pillow.
+
+        libjpeg-turbo cannot convert CMYK or YCCK JPEGs to RGB, and Pillow may
+        still accept a file the strict turbo decoder rejects. The turbo decoder
+        also needs the whole file in memory, so uploads larger than
+        TURBO_DECODE_MAX_BYTES are left to Pillow, which streams from image_file.
+        """
+        data = image_file.read(TURBO_DECODE_MAX_BYTES + 1)
+        if len(data) > TURBO_DECODE_MAX_BYTES:
+            image_file.seek(0)
+            return Image.open(image_file)
+        try:
+            _, _, _, colorspace = tj.decode_header(data)
+            if colorspace not in (TJCS_CMYK, TJCS_YCCK):
+                return Image.fromarray(tj.decode(data, pixel_format=TJPF_RGB))
+        except OSError as e:
+            logger.debug(f"libjpeg-turbo could not decode JPEG, using Pillow: {e}")
+        image_file.seek(0)
+        return Image.open(image_file)
 
     def _resize_image(
         self,
         image: Image.Image,
         max_size: tuple[int, int],
+        file_path: Path,
         quality: int = 92,
-    ) -> bytes:
-        """Resize image maintaining aspect ratio."""
+        optimize: bool = False,
+    ) -> None:
+        """
+        Resize image maintaining aspect ratio and write it to file_path.
+
+        Huffman-table optimization roughly doubles encode time for a few percent
+        smaller output, so it is only worth enabling for the original size.
+        """
         # Convert to RGB if necessary (handles RGBA, P mode, etc.)
-        if image.mode in ("RGBA", "P", "LA"):
-            background = Image.new("RGB", image.size, (255, 255, 255))
-            if image.mode == "P":
-                image = image.convert("RGBA")
-            background.paste(image, mask=image.split()[-1] if image.mode == "RGBA" else None)
-            image = background
-        elif image.mode != "RGB":
-            image = image.convert("RGB")
+        image = _flatten_to_rgb(image)
 
         # Resize maintaining aspect ratio
         image.thumbnail(max_size, Image.Resampling.LANCZOS)
 
-        # Save to bytes
-        output = BytesIO()
-        image.save(output, format="JPEG", quality=quality, optimize=True)
-        return output.getvalue()
+        self._save_jpeg(image, file_path, quality, optimize=optimize)
+
+    def _save_jpeg(
+        self,
+        image: Image.Image,
+        file_path: Path,
+        quality: int,
+        optimize: bool = False,
+    ) -> None:
+        """
+        Encode an RGB image as baseline JPEG straight to file_path.
+
+        Uses libjpeg-turbo when available; the library is loaded once by
+        _get_turbojpeg, though each encode still sets up its own compressor. The
+        turbo API has no Huffman optimization pass, so optimized encodes always go
+        through Pillow. Pillow writes into the open file handle, avoiding an
+        intermediate BytesIO copy of the output.
+        """
+        tj = _get_turbojpeg()
+        if tj is not None and not optimize:
+            _atomic_write(
+                file_path,
+                tj.encode(
+                    np.asarray(image),
+                    quality=quality,
+                    pixel_format=TJPF_RGB,
+                    jpeg_subsample=TJSAMP_420 if quality <= 90 else TJSAMP_422,
+                ),
+            )
+            return
+
+        with _atomic_path(file_path) as tmp_path, tmp_path.open("wb") as fh:
+            image.save(fh, format="JPEG", quality=quality, optimize=optimize, progressive=False)
+
+    def _vips_resize_image(
+        self,
+        image_data: bytes,
+        max_size: tuple[int, int],
+        quality: int,
+        file_path: Path,
+        optimize: bool = False,
+    ) -> None:
+        """
+        Resize and encode with libvips (runs in a worker thread).
+
+        thumbnail_buffer uses shrink-on-load and processes the image in strips,
+        so the full-resolution bitmap is never materialized.
+        """
+        image = pyvips.Image.thumbnail_buffer(
+            image_data, max_size[0], height=max_size[1], size="down", no_rotate=True
+        )
+        if image.interpretation != "srgb":
+            image = image.colourspace("srgb")
+        if image.hasalpha():
+            image = image.flatten(background=255)
+        with _atomic_path(file_path) as tmp_path:
+            image.jpegsave(str(tmp_path), Q=quality, optimize_coding=optimize, strip=True)
 
     async def process_and_store(
         self,
         user_id: uuid.UUID,
-        image_data: bytes,
+        image_file: BinaryIO,
         original_filename: str,
     ) -> dict[str, str]:
         """
         Process an uploaded image and store all sizes.
 
+        image_file is read as a stream (e.g. an UploadFile's spooled temp file), so
+        Pillow decodes straight from it without the whole upload being copied into
+        a bytes object first.
+
         Returns dict with paths for each size:
         {
             "original": "user_id/20240116_123456_abc123.jpg",
@@ -103,11 +310,26 @@ class ImageService:
         if ext not in ALLOWED_EXTENSIONS:
             raise ValueError(f"Unsupported file type: {ext}")
 
-        # Load image
-        if ext in (".heic", ".heif"):
-            image = self._convert_heic(image_data)
+        # libvips handles everything except HEIC; otherwise decode with Pillow
+        use_vips = pyvips is not None and ext not in (".heic", ".heif")
+
+        image = None
+        image_data = None
+        image_file.seek(0)
+        if use_vips:
+            # libvips shrinks on load from an in-memory buffer
+            image_data = image_file.read()
         else:
-            image = Image.open(BytesIO(image_data))
+            tj = _get_turbojpeg()
+            if ext in (".heic", ".heif"):
+                image = self._convert_heic(image_file)
+            elif tj is not None and ext in (".jpg", ".jpeg"):
+                image = self._decode_jpeg(tj, image_file)
+            else:
+                image = Image.open(image_file)
+
+            # Decode once up front so each size works from an independent copy
+            image.load()
 
         # Generate base filename
         base_filename = self._generate_filename(".jpg")
@@ -116,7 +338,9 @@ class ImageService:
         user_path = self._get_user_path(user_id)
         paths = {}
 
-        # Process and save each size
+        # Encode each size in its own thread; libvips and Pillow both release
+        # the GIL while resampling and JPEG-encoding, so the sizes run in parallel
+        tasks = []
         for size_name, max_size in SIZES.items():
             if size_name == "original":
                 suffix = ""
@@ -130,17 +354,38 @@ class ImageService:
 
             filename = f"{base_name}{suffix}.jpg"
             file_path = user_path / filename
-
-            # For original, preserve as much quality as possible
-            # For others, resize with appropriate quality
-            resized_data = self._resize_image(image.copy(), max_size, quality=quality)
-            file_path.write_bytes(resized_data)
+            optimize = size_name == "original"
+
+            if image is None:
+                tasks.append(
+                    asyncio.to_thread(
+                        self._vips_resize_image,
+                        image_data,
+                        max_size,
+                        quality,
+                        file_path,
+                        optimize,
+                    )
+                )
+            else:
+                tasks.append(
+                    asyncio.to_thread(
+                        self._resize_image,
+                        image.copy(),
+                        max_size,
+                        file_path,
+                        quality,
+                        optimize,
+                    )
+                )
 
             # Store relative path
             paths[size_name] = f"{user_id}/{filename}"
 
+        await asyncio.gather(*tasks)
+
         # Compute perceptual hash for duplicate detection
-        image_hash = self.compute_phash(image_data, original_filename)
+        image_hash = self.compute_phash(image_file, original_filename)
 
         return {
             "image_path": paths["original"],
@@ -153,35 +398,56 @@ class ImageService:
         """Get full path for an image."""
         return self.storage_path / relative_path
 
-    def delete_images(self, paths: dict[str, str | None]) -> None:
-        """Delete all image files for an item."""
-        for path in paths.values():
-            if path:
-                full_path = self.storage_path / path
-                if full_path.exists():
-                    full_path.unlink()
+    @staticmethod
+    def _unlink_if_exists(path: Path) -> None:
+        """Delete a file, ignoring it if it is already gone."""
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
 
-    def validate_image(self, image_data: bytes, content_type: str) -> bool:
+    async def delete_images(self, paths: dict[str, str | None]) -> None:
+        """Delete all image files for an item."""
+        await asyncio.gather(
+            *(
+                asyncio.to_thread(self._unlink_if_exists, self.storage_path / path)
+                for path in paths.values()
+                if path
+            )
+        )
+
+    def validate_image(self, image_file: BinaryIO, content_type: str) -> bool:
         """Validate image data and content type."""
         # Check content type
         if content_type not in ALLOWED_MIME_TYPES:
             return False
 
         # Check file size (max 20MB)
-        if len(image_data) > 20 * 1024 * 1024:
+        image_file.seek(0, os.SEEK_END)
+        size = image_file.tell()
+        image_file.seek(0)
+        if size > 20 * 1024 * 1024:
+            return False
+
+        # Reject unknown formats from the magic bytes before invoking a decoder
+        header = image_file.read(12)
+        image_file.seek(0)
+        if not _has_image_signature(header):
             return False
 
-        # Try to open as image
+        # Check the image headers without decoding the pixel data
         try:
             if content_type in ("image/heic", "image/heif"):
-                self._convert_heic(image_data)
+                self._convert_heic(image_file).verify()
             else:
-                Image.open(BytesIO(image_data))
+                Image.open(image_file).verify()
             return True
         except Exception:
             return False
+        finally:
+            image_file.seek(0)
 
-    def compute_phash(self, image_data: bytes, original_filename: str) -> str:
+    def compute_phash(self, image_file: BinaryIO, original_filename: str) -> str:
         """
         Compute perceptual hash (pHash) for an image.
 
@@ -189,26 +455,17 @@ class ImageService:
         """
         ext = Path(original_filename).suffix.lower()
 
+        image_file.seek(0)
         if ext in (".heic", ".heif"):
-            image = self._convert_heic(image_data)
+            image = self._convert_heic(image_file)
         else:
-            image = Image.open(BytesIO(image_data))
-
-        # Convert to RGB if needed for consistent hashing
-        if image.mode != "RGB":
-            image = image.convert("RGB")
+            image = Image.open(image_file)
 
-        # Compute perceptual hash
-        phash = imagehash.phash(image)
-        return str(phash)
+        return _phash(image)
 
     def compute_phash_from_path(self, image_path: Path) -> str:
         """Compute pHash from a file path."""
-        image = Image.open(image_path)
-        if image.mode != "RGB":
-            image = image.convert("RGB")
-        phash = imagehash.phash(image)
-        return str(phash)
+        return _phash(Image.open(image_path))
 
     @staticmethod
     def hash_distance(hash1: str, hash2: str) -> int:
@@ -219,9 +476,7 @@ class ImageService:
         Distance 0 = identical/near-identical images.
         Distance < 10 = very similar images.
         """
-        h1 = imagehash.hex_to_hash(hash1)
-        h2 = imagehash.hex_to_hash(hash2)
-        return h1 - h2
+        return (int(hash1, 16) ^ int(hash2, 16)).bit_count()
 
     @staticmethod
     def is_duplicate(hash1: str, hash2: str, threshold: int = 8) -> bool:
@@ -259,6 +514,16 @@ class ImageService:
         if not original_full.exists():
             raise ValueError(f"Image not found: {image_path}")
 
+        paths = {
+            "image_path": image_path,
+            "medium_path": medium_path,
+            "thumbnail_path": thumb_path,
+        }
+
+        # Stored sizes are all JPEGs, so rotate them in the DCT domain when possible
+        if self._rotate_lossless([original_full, medium_full, thumb_full], direction):
+            return paths
+
         # Determine rotation angle
         angle = -90 if direction == "cw" else 90  # PIL rotates counter-clockwise by default
 
@@ -266,14 +531,7 @@ class ImageService:
         image = Image.open(original_full)
 
         # Convert to RGB if necessary
-        if image.mode in ("RGBA", "P", "LA"):
-            background = Image.new("RGB", image.size, (255, 255, 255))
-            if image.mode == "P":
-                image = image.convert("RGBA")
-            background.paste(image, mask=image.split()[-1] if image.mode == "RGBA" else None)
-            image = background
-        elif image.mode != "RGB":
-            image = image.convert("RGB")
+        image = _flatten_to_rgb(image)
 
         # Rotate
         rotated = image.rotate(angle, expand=True)
@@ -295,12 +553,43 @@ class ImageService:
             img_copy.thumbnail(max_size, Image.Resampling.LANCZOS)
 
             # Save
-            output = BytesIO()
-            img_copy.save(output, format="JPEG", quality=quality, optimize=True)
-            file_path.write_bytes(output.getvalue())
+            self._save_jpeg(img_copy, file_path, quality, optimize=size_name == "original")
 
-        return {
-            "image_path": image_path,
-            "medium_path": medium_path,
-            "thumbnail_path": thumb_path,
-        }
+        return paths
+
+    def _rotate_lossless(self, file_paths: list[Path], direction: str) -> bool:
+        """
+        Rotate JPEG files by 90° with jpegtran, without decoding or re-encoding.
+
+        Returns False, leaving every file untouched, if jpegtran is unavailable
+        or any file cannot be transformed perfectly. A JPEG whose dimensions are
+        not a multiple of its block size has partial edge blocks that jpegtran
+        can only rotate by trimming them, which would crop the image a little on
+        every rotation; those fall back to re-encoding instead.
+        """
+        jpegtran = _get_jpegtran()
+        if jpegtran is None:
+            return False
+
+        degrees = "90" if direction == "cw" else "270"
+        rotated: list[tuple[Path, bytes]] = []
+        for file_path in file_paths:
+            if not file_path.exists():
+                return False
+            # -perfect fails rather than trimming partial edge blocks
+            result = subprocess.run(
+                [jpegtran, "-rotate", degrees, "-perfect", "-copy", "none", str(file_path)],
+                capture_output=True,
+                check=False,
+            )
+            if result.returncode != 0 or not result.stdout:
+                logger.info(
+                    f"Cannot rotate {file_path} losslessly, re-encoding instead: "
+                    f"{result.stderr.decode(errors='replace').strip()}"
+                )
+                return False
+            rotated.append((file_path, result.stdout))
+
+        for file_path, data in rotated:
+            _atomic_write(file_path, data)
+        return True
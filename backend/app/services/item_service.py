@@ -1,45 +1,147 @@
-from collections import Counter
+import re
 from datetime import UTC, date, datetime, timedelta
 from uuid import UUID
 from zoneinfo import ZoneInfo
 
-from sqlalchemy import and_, func, or_, select
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    and_,
+    case,
+    cast,
+    exists,
+    false,
+    func,
+    inspect,
+    lambda_stmt,
+    literal_column,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, BIT
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import attributes, selectinload
 
-from app.models.item import ClothingItem, ItemHistory, ItemStatus, WashHistory
+from app.models.item import (
+    ClothingItem,
+    ItemColorCount,
+    ItemHistory,
+    ItemStatus,
+    ItemTypeCount,
+    WashHistory,
+)
 from app.schemas.item import DEFAULT_WASH_INTERVALS, ItemCreate, ItemFilter, ItemUpdate
 
 
+def _search_document() -> ColumnElement:
+    """
+    The full-text document of an item: its name, brand, type and notes.
+
+    Renders as the same expression idx_clothing_items_search_document indexes,
+    with literals inlined rather than bound, so Postgres can match the two.
+    """
+    document = None
+    for column in (
+        ClothingItem.name,
+        ClothingItem.brand,
+        ClothingItem.type,
+        ClothingItem.notes,
+    ):
+        part = func.coalesce(column, literal_column("''"))
+        document = part if document is None else document + literal_column("' '") + part
+    return func.to_tsvector(literal_column("'english'"), document)
+
+
+def _search_condition(search: str) -> ColumnElement[bool]:
+    """
+    Match items whose full-text document contains every word of the search.
+
+    Words are prefix-matched so partial input ("shi") still finds "shirt", and
+    only word characters reach to_tsquery so user input cannot inject operators.
+    Unlike the substring ILIKE search this replaced, a word only matches from its
+    start ("shirt" does not find "tshirt"), and English stopwords are dropped, so
+    a search made only of stopwords ("the") matches nothing.
+    """
+    words = re.findall(r"\w+", search)
+    if not words:
+        return false()
+    tsquery = " & ".join(f"{word}:*" for word in words)
+    condition = _search_document().op("@@")(func.to_tsquery("english", tsquery))
+    # Brands like "H&M" or "Levi's" tokenize poorly, so a search that names a
+    # brand verbatim also matches it case-insensitively via the lower(brand) index
+    return condition | (func.lower(ClothingItem.brand) == search.strip().lower())
+
+
+def _hash_to_int(hex_hash: str) -> int:
+    """Convert a 16-character pHash hex string to the signed 64-bit value stored in Postgres."""
+    return int.from_bytes(bytes.fromhex(hex_hash), "big", signed=True)
+
+
+def _hash_distance(image_hash: int) -> ColumnElement[int]:
+    """
+    Hamming distance between an item's stored pHash and image_hash.
+
+    Computed by Postgres with bit_count over the XOR of the two 64-bit values,
+    so near-duplicates are found in a single query.
+    """
+    return func.bit_count(cast(ClothingItem.image_hash.op("#")(image_hash), BIT(64)))
+
+
+def _duplicate_conditions(
+    user_id: UUID, hash_value: int, threshold: int
+) -> tuple[ColumnElement[bool], ColumnElement[bool] | None]:
+    """
+    Conditions matching a user's active items that duplicate hash_value.
+
+    Returns the exact-hash condition, probed first through
+    idx_clothing_items_user_hash_active, and the Hamming-distance condition that
+    scans the user's items when the exact probe finds nothing (None when
+    threshold is 0, i.e. exact matching only).
+    """
+    # "= false" rather than "IS false" so the partial index predicate matches
+    active = and_(
+        ClothingItem.user_id == user_id,
+        ClothingItem.is_archived == False,  # noqa: E712
+    )
+    exact = and_(active, ClothingItem.image_hash == hash_value)
+    if threshold <= 0:
+        return exact, None
+    near = and_(
+        active,
+        ClothingItem.image_hash.is_not(None),
+        _hash_distance(hash_value) <= threshold,
+    )
+    return exact, near
+
+
 class ItemService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
     async def get_by_id(self, item_id: UUID, user_id: UUID) -> ClothingItem | None:
-        result = await self.db.execute(
-            select(ClothingItem)
-            .where(and_(ClothingItem.id == item_id, ClothingItem.user_id == user_id))
-            .options(selectinload(ClothingItem.additional_images))
-        )
-        return result.scalar_one_or_none()
-
-    async def get_list(
-        self,
-        user_id: UUID,
-        filters: ItemFilter,
-        page: int = 1,
-        page_size: int = 20,
-    ) -> tuple[list[ClothingItem], int]:
-        # Base query
-        query = (
-            select(ClothingItem)
-            .where(ClothingItem.user_id == user_id)
-            .options(selectinload(ClothingItem.additional_images))
+        # session.get() returns an item already in the identity map without a query
+        item = await self.db.get(
+            ClothingItem, item_id, options=[selectinload(ClothingItem.additional_images)]
         )
+        if item is None or item.user_id != user_id:
+            return None
+        # A cached item may have columns expired by a flush (e.g. updated_at) or,
+        # if another query loaded it, no images yet; load those without lazy IO
+        state = inspect(item)
+        stale = set(state.expired_attributes)
+        if "additional_images" in state.unloaded:
+            stale.add("additional_images")
+        if stale:
+            await self.db.refresh(item, list(stale))
+        return item
 
+    @staticmethod
+    def _apply_filters(query: Select, filters: ItemFilter) -> Select:
         # Apply filters
         if filters.type:
-            query = query.where(ClothingItem.type == filters.type)
+            query = query.where(func.lower(ClothingItem.type) == filters.type.lower())
         if filters.subtype:
             query = query.where(ClothingItem.subtype == filters.subtype)
         if filters.status:
@@ -58,20 +160,28 @@ class ItemService:
 
         # Search filter
         if filters.search:
-            search_term = f"%{filters.search}%"
-            query = query.where(
-                or_(
-                    ClothingItem.name.ilike(search_term),
-                    ClothingItem.brand.ilike(search_term),
-                    ClothingItem.type.ilike(search_term),
-                    ClothingItem.notes.ilike(search_term),
-                )
-            )
+            query = query.where(_search_condition(filters.search))
+
+        return query
+
+    async def get_list(
+        self,
+        user_id: UUID,
+        filters: ItemFilter,
+        page: int = 1,
+        page_size: int = 20,
+    ) -> tuple[list[ClothingItem], int]:
+        # Base query; the window count returns the filtered total alongside each
+        # row, so the filters are evaluated once instead of in a separate COUNT query
+        query = select(ClothingItem, func.count().over().label("total_count")).where(
+            ClothingItem.user_id == user_id
+        )
+
+        query = self._apply_filters(query, filters)
 
-        # Get total count
-        count_query = select(func.count()).select_from(query.subquery())
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar() or 0
+        # Keep the filtered query for the out-of-range count below
+        filtered = query
+        query = query.options(selectinload(ClothingItem.additional_images))
 
         # Sorting
         sort_columns = {
@@ -82,17 +192,72 @@ class ItemService:
             "type": ClothingItem.type,
         }
         sort_col = sort_columns.get(filters.sort_by or "", ClothingItem.created_at)
-        if filters.sort_order == "asc":
+        if sort_col is ClothingItem.created_at:
+            # created_at is never null, so it needs no NULLS LAST; the plain order,
+            # with ties broken by id so pages line up with get_list_after cursors,
+            # is what idx_clothing_items_user_archived_created yields in either direction
+            if filters.sort_order == "asc":
+                query = query.order_by(ClothingItem.created_at.asc(), ClothingItem.id.asc())
+            else:
+                query = query.order_by(ClothingItem.created_at.desc(), ClothingItem.id.desc())
+        elif filters.sort_order == "asc":
             query = query.order_by(sort_col.asc().nulls_last())
         else:
             query = query.order_by(sort_col.desc().nulls_last())
         query = query.offset((page - 1) * page_size).limit(page_size)
 
         result = await self.db.execute(query)
-        items = list(result.scalars().all())
+        rows = result.all()
+        items = [row.ClothingItem for row in rows]
+        if rows:
+            total = rows[0].total_count
+        elif page > 1:
+            # A page past the end has no rows to carry the window count
+            count_query = select(func.count()).select_from(
+                filtered.with_only_columns(ClothingItem.id).subquery()
+            )
+            total = (await self.db.execute(count_query)).scalar_one()
+        else:
+            total = 0
 
         return items, total
 
+    async def get_list_after(
+        self,
+        user_id: UUID,
+        filters: ItemFilter,
+        cursor: tuple[datetime, UUID],
+        page_size: int = 20,
+    ) -> tuple[list[ClothingItem], bool]:
+        """
+        Fetch the page of items that follows cursor in created_at order.
+
+        Keyset pagination: the (created_at, id) cursor of the previous page's last
+        item seeks straight to the next page, so deep pages cost the same as the
+        first. Returns the items and whether more follow; no total is counted.
+        """
+        query = self._apply_filters(
+            select(ClothingItem).where(ClothingItem.user_id == user_id), filters
+        )
+
+        # The row comparison and order follow idx_clothing_items_user_archived_created
+        # key for key, so the seek and the page come straight off the index
+        key = tuple_(ClothingItem.created_at, ClothingItem.id)
+        if filters.sort_order == "asc":
+            query = query.where(key > tuple_(*cursor)).order_by(
+                ClothingItem.created_at.asc(), ClothingItem.id.asc()
+            )
+        else:
+            query = query.where(key < tuple_(*cursor)).order_by(
+                ClothingItem.created_at.desc(), ClothingItem.id.desc()
+            )
+        # One extra row tells whether another page follows
+        query = query.options(selectinload(ClothingItem.additional_images)).limit(page_size + 1)
+
+        result = await self.db.execute(query)
+        items = list(result.scalars().all())
+        return items[:page_size], len(items) > page_size
+
     async def get_ids_by_filter(
         self,
         user_id: UUID,
@@ -104,45 +269,70 @@ class ItemService:
         query = select(ClothingItem.id).where(ClothingItem.user_id == user_id)
 
         if type_filter:
-            query = query.where(ClothingItem.type == type_filter)
+            # Same case-insensitive match as the list view's type filter
+            query = query.where(func.lower(ClothingItem.type) == type_filter.lower())
 
         query = query.where(ClothingItem.is_archived == is_archived)
 
         if search:
-            search_term = f"%{search}%"
-            query = query.where(
-                or_(
-                    ClothingItem.name.ilike(search_term),
-                    ClothingItem.brand.ilike(search_term),
-                    ClothingItem.type.ilike(search_term),
-                    ClothingItem.notes.ilike(search_term),
-                )
-            )
+            query = query.where(_search_condition(search))
 
         if excluded_ids:
-            query = query.where(ClothingItem.id.notin_(excluded_ids))
-
-        result = await self.db.execute(query)
-        return list(result.scalars().all())
+            # Bind the exclusions as one uuid[] parameter; an expanding NOT IN list
+            # renders a differently shaped statement for every selection size
+            excluded = select(
+                func.unnest(cast(excluded_ids, ARRAY(PG_UUID(as_uuid=True))))
+            ).scalar_subquery()
+            query = query.where(ClothingItem.id.not_in(excluded))
+
+        # Select-all bulk actions can match thousands of rows; fetch them through a
+        # server-side cursor in batches instead of buffering the whole result set
+        result = await self.db.stream_scalars(query.execution_options(yield_per=1000))
+        return [item_id async for item_id in result]
 
     async def find_duplicate_by_hash(
         self,
         user_id: UUID,
         image_hash: str,
-        threshold: int = 8,
+        threshold: int = 2,
     ) -> ClothingItem | None:
-        # For exact duplicate detection (same hash)
+        """
+        Find an active item whose photo is the same as, or nearly the same as, image_hash.
+
+        Re-saving, resizing or re-exporting a photo moves its pHash by a bit or
+        two, so those re-uploads are caught as well as byte-identical ones. The
+        default threshold is kept tight at 2 of 64 bits: distinct garments shot
+        against the same background can land within a handful of bits of each
+        other, and a match rejects the upload. Pass threshold=0 for exact matching.
+        """
+        hash_value = _hash_to_int(image_hash)
+        exact, near = _duplicate_conditions(user_id, hash_value, threshold)
+        result = await self.db.execute(select(ClothingItem).where(exact).limit(1))
+        item = result.scalar_one_or_none()
+        if item is not None or near is None:
+            return item
+
         result = await self.db.execute(
-            select(ClothingItem).where(
-                and_(
-                    ClothingItem.user_id == user_id,
-                    ClothingItem.image_hash == image_hash,
-                    ClothingItem.is_archived.is_(False),
-                )
-            )
+            select(ClothingItem).where(near).order_by(_hash_distance(hash_value)).limit(1)
         )
         return result.scalar_one_or_none()
 
+    async def duplicate_exists(
+        self,
+        user_id: UUID,
+        image_hash: str,
+        threshold: int = 2,
+    ) -> bool:
+        """Like find_duplicate_by_hash, for callers that only need a yes/no answer."""
+        exact, near = _duplicate_conditions(user_id, _hash_to_int(image_hash), threshold)
+        result = await self.db.execute(select(exists().where(exact)))
+        if result.scalar():
+            return True
+        if near is None:
+            return False
+        result = await self.db.execute(select(exists().where(near)))
+        return bool(result.scalar())
+
     async def create(
         self,
         user_id: UUID,
@@ -153,6 +343,7 @@ class ItemService:
         tags = {}
         if item_data.tags:
             tags = item_data.tags.model_dump(exclude_none=True)
+        image_hash = image_paths.get("image_hash")
 
         # Create item
         item = ClothingItem(
@@ -160,7 +351,7 @@ class ItemService:
             image_path=image_paths["image_path"],
             thumbnail_path=image_paths.get("thumbnail_path"),
             medium_path=image_paths.get("medium_path"),
-            image_hash=image_paths.get("image_hash"),
+            image_hash=_hash_to_int(image_hash) if image_hash else None,
             type=item_data.type,
             subtype=item_data.subtype,
             tags=tags,
@@ -176,58 +367,80 @@ class ItemService:
         )
 
         self.db.add(item)
+        # The INSERT already fetches server defaults via RETURNING; a new item has
+        # no additional images, so mark the collection loaded instead of selecting it
         await self.db.flush()
-        await self.db.refresh(item, ["additional_images"])
+        attributes.set_committed_value(item, "additional_images", [])
         return item
 
     async def update(self, item: ClothingItem, item_data: ItemUpdate) -> ClothingItem:
+        # model_dump already serializes the nested ItemTags to a dict
         update_data = item_data.model_dump(exclude_unset=True)
+        if update_data.get("tags"):
+            update_data["tags"] = {k: v for k, v in update_data["tags"].items() if v is not None}
 
-        if "tags" in update_data and update_data["tags"]:
-            tags = update_data["tags"]
-            if isinstance(tags, dict):
-                update_data["tags"] = {k: v for k, v in tags.items() if v is not None}
-            else:
-                update_data["tags"] = tags.model_dump(exclude_none=True)
-
-        for field, value in update_data.items():
-            setattr(item, field, value)
+        if not update_data:
+            return item
 
-        if "tags" in update_data:
-            attributes.flag_modified(item, "tags")
+        return await self._update_returning(item, **update_data)
 
-        await self.db.flush()
-        # Re-fetch with eager loading to ensure relationships are properly loaded
-        result = await self.get_by_id(item.id, item.user_id)
-        return result  # type: ignore[return-value]
+    async def _update_returning(self, item: ClothingItem, **values) -> ClothingItem:
+        # UPDATE ... RETURNING writes the changes and refreshes the identity-mapped
+        # item (including the server-side updated_at) in one round trip.
+        # populate_existing makes the returned row overwrite the loaded item instead
+        # of relying on how synchronize_session evaluates SQL expressions like
+        # wear_count + 1; it also resets additional_images, so reload that eagerly
+        result = await self.db.execute(
+            update(ClothingItem)
+            .where(ClothingItem.id == item.id, ClothingItem.user_id == item.user_id)
+            .values(**values)
+            .returning(ClothingItem)
+            .options(selectinload(ClothingItem.additional_images))
+            .execution_options(populate_existing=True)
+        )
+        return result.scalar_one()
 
     async def delete(self, item: ClothingItem) -> None:
         await self.db.delete(item)
         await self.db.flush()
 
-    async def archive(
+    async def archive_by_id(
         self,
-        item: ClothingItem,
+        item_id: UUID,
+        user_id: UUID,
         reason: str | None = None,
-    ) -> ClothingItem:
-        item.is_archived = True
-        item.archived_at = datetime.now(UTC)
-        item.archive_reason = reason
-        item.status = ItemStatus.archived
-        await self.db.flush()
-        # Re-fetch with eager loading to ensure relationships are properly loaded
-        result = await self.get_by_id(item.id, item.user_id)
-        return result  # type: ignore[return-value]
-
-    async def restore(self, item: ClothingItem) -> ClothingItem:
-        item.is_archived = False
-        item.archived_at = None
-        item.archive_reason = None
-        item.status = ItemStatus.ready
-        await self.db.flush()
-        # Re-fetch with eager loading to ensure relationships are properly loaded
-        result = await self.get_by_id(item.id, item.user_id)
-        return result  # type: ignore[return-value]
+    ) -> ClothingItem | None:
+        return await self._update_by_id(
+            item_id,
+            user_id,
+            is_archived=True,
+            archived_at=datetime.now(UTC),
+            archive_reason=reason,
+            status=ItemStatus.archived,
+        )
+
+    async def restore_by_id(self, item_id: UUID, user_id: UUID) -> ClothingItem | None:
+        return await self._update_by_id(
+            item_id,
+            user_id,
+            is_archived=False,
+            archived_at=None,
+            archive_reason=None,
+            status=ItemStatus.ready,
+        )
+
+    async def _update_by_id(self, item_id: UUID, user_id: UUID, **values) -> ClothingItem | None:
+        # Ownership check, write and load in one UPDATE ... RETURNING, so callers
+        # need no get_by_id first; returns None if the user has no such item
+        result = await self.db.execute(
+            update(ClothingItem)
+            .where(ClothingItem.id == item_id, ClothingItem.user_id == user_id)
+            .values(**values)
+            .returning(ClothingItem)
+            .options(selectinload(ClothingItem.additional_images))
+            .execution_options(populate_existing=True)
+        )
+        return result.scalar_one_or_none()
 
     async def log_wear(
         self,
@@ -246,22 +459,21 @@ class ItemService:
             notes=notes,
         )
         self.db.add(history)
+        await self.db.flush()
 
-        # Update item stats
-        item.wear_count += 1
-        item.last_worn_at = worn_at
-
-        # Update wash tracking
-        item.wears_since_wash += 1
-        effective_interval = (
-            item.wash_interval
-            if item.wash_interval is not None
-            else DEFAULT_WASH_INTERVALS.get(item.type, 3)
+        # Update item stats and wash tracking in place on the server, so concurrent
+        # wears cannot lose an increment; RETURNING refreshes the loaded item
+        effective_interval = func.coalesce(
+            ClothingItem.wash_interval,
+            case(DEFAULT_WASH_INTERVALS, value=ClothingItem.type, else_=3),
+        )
+        await self._update_returning(
+            item,
+            wear_count=ClothingItem.wear_count + 1,
+            last_worn_at=func.greatest(ClothingItem.last_worn_at, worn_at),
+            wears_since_wash=ClothingItem.wears_since_wash + 1,
+            needs_wash=ClothingItem.wears_since_wash + 1 >= effective_interval,
         )
-        item.needs_wash = item.wears_since_wash >= effective_interval
-
-        await self.db.flush()
-        await self.db.refresh(history)
         return history
 
     async def log_wash(
@@ -278,14 +490,12 @@ class ItemService:
             notes=notes,
         )
         self.db.add(wash)
+        await self.db.flush()
 
         # Reset wash tracking
-        item.wears_since_wash = 0
-        item.last_washed_at = washed_at
-        item.needs_wash = False
-
-        await self.db.flush()
-        await self.db.refresh(wash)
+        await self._update_returning(
+            item, wears_since_wash=0, last_washed_at=washed_at, needs_wash=False
+        )
         return wash
 
     async def get_wash_history(
@@ -294,10 +504,14 @@ class ItemService:
         limit: int = 10,
     ) -> list[WashHistory]:
         result = await self.db.execute(
-            select(WashHistory)
-            .where(WashHistory.item_id == item_id)
-            .order_by(WashHistory.washed_at.desc())
-            .limit(limit)
+            lambda_stmt(
+                lambda: (
+                    select(WashHistory)
+                    .where(WashHistory.item_id == item_id)
+                    .order_by(WashHistory.washed_at.desc())
+                    .limit(limit)
+                )
+            )
         )
         return list(result.scalars().all())
 
@@ -306,11 +520,17 @@ class ItemService:
         item_id: UUID,
         limit: int = 10,
     ) -> list[ItemHistory]:
+        # Load the item up front; a lazy load of history.item fails under asyncio
         result = await self.db.execute(
-            select(ItemHistory)
-            .where(ItemHistory.item_id == item_id)
-            .order_by(ItemHistory.worn_at.desc())
-            .limit(limit)
+            lambda_stmt(
+                lambda: (
+                    select(ItemHistory)
+                    .options(selectinload(ItemHistory.item))
+                    .where(ItemHistory.item_id == item_id)
+                    .order_by(ItemHistory.worn_at.desc())
+                    .limit(limit)
+                )
+            )
         )
         return list(result.scalars().all())
 
@@ -327,39 +547,61 @@ class ItemService:
         if item.last_worn_at:
             days_since_last_worn = (user_today - item.last_worn_at).days
 
-        # Get all wear history for this item
-        result = await self.db.execute(
-            select(ItemHistory)
-            .where(ItemHistory.item_id == item.id)
-            .order_by(ItemHistory.worn_at.desc())
+        # Aggregate wear history in the database rather than loading every row.
+        # The queries run back to back because an AsyncSession can't multiplex
+        # statements on its connection.
+        six_months_ago = user_today - timedelta(days=180)
+
+        # Wear count per month (last 6 months)
+        month = func.to_char(ItemHistory.worn_at, "YYYY-MM")
+        month_result = await self.db.execute(
+            select(month, func.count())
+            .where(
+                and_(
+                    ItemHistory.item_id == item.id,
+                    ItemHistory.worn_at >= six_months_ago,
+                )
+            )
+            .group_by(month)
         )
-        history = list(result.scalars().all())
+        month_counts = dict(month_result.all())
 
         # Average wears per month (over last 6 months)
-        six_months_ago = user_today - timedelta(days=180)
-        recent_wears = [h for h in history if h.worn_at >= six_months_ago]
-        avg_per_month = round(len(recent_wears) / 6, 1) if recent_wears else 0
+        recent_wears = sum(month_counts.values())
+        avg_per_month = round(recent_wears / 6, 1) if recent_wears else 0
 
         # Wear by month (last 6 months)
         wear_by_month: dict[str, int] = {}
         for i in range(5, -1, -1):
             d = user_today - timedelta(days=30 * i)
             key = d.strftime("%Y-%m")
-            wear_by_month[key] = 0
-        for h in recent_wears:
-            key = h.worn_at.strftime("%Y-%m")
-            if key in wear_by_month:
-                wear_by_month[key] += 1
+            wear_by_month[key] = month_counts.get(key, 0)
 
-        # Wear by day of week
+        # Wear by day of week (ISO: 1 = Monday ... 7 = Sunday)
         day_names = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
         wear_by_day = dict.fromkeys(day_names, 0)
-        for h in history:
-            wear_by_day[day_names[h.worn_at.weekday()]] += 1
+        isodow = func.extract("isodow", ItemHistory.worn_at)
+        dow_result = await self.db.execute(
+            select(isodow, func.count()).where(ItemHistory.item_id == item.id).group_by(isodow)
+        )
+        for dow, count in dow_result.all():
+            wear_by_day[day_names[int(dow) - 1]] = count
 
-        # Most common occasion
-        occasions = [h.occasion for h in history if h.occasion]
-        most_common_occasion = Counter(occasions).most_common(1)[0][0] if occasions else None
+        # Most common occasion (ties go to the most recently worn)
+        occasion_result = await self.db.execute(
+            select(ItemHistory.occasion)
+            .where(
+                and_(
+                    ItemHistory.item_id == item.id,
+                    ItemHistory.occasion.is_not(None),
+                    ItemHistory.occasion != "",
+                )
+            )
+            .group_by(ItemHistory.occasion)
+            .order_by(func.count().desc(), func.max(ItemHistory.worn_at).desc())
+            .limit(1)
+        )
+        most_common_occasion = occasion_result.scalar_one_or_none()
 
         return {
             "total_wears": item.wear_count,
@@ -372,31 +614,24 @@ class ItemService:
 
     async def get_item_types(self, user_id: UUID) -> list[dict]:
         result = await self.db.execute(
-            select(ClothingItem.type, func.count(ClothingItem.id).label("count"))
-            .where(
-                and_(
-                    ClothingItem.user_id == user_id,
-                    ClothingItem.is_archived == False,  # noqa: E712
+            lambda_stmt(
+                lambda: (
+                    select(ItemTypeCount.type, ItemTypeCount.count)
+                    .where(ItemTypeCount.user_id == user_id)
+                    .order_by(ItemTypeCount.count.desc())
                 )
             )
-            .group_by(ClothingItem.type)
-            .order_by(func.count(ClothingItem.id).desc())
         )
-        return [{"type": row.type, "count": row.count} for row in result.all()]
+        return [dict(row) for row in result.mappings()]
 
     async def get_color_distribution(self, user_id: UUID) -> list[dict]:
         result = await self.db.execute(
-            select(
-                func.unnest(ClothingItem.colors).label("color"),
-                func.count().label("count"),
-            )
-            .where(
-                and_(
-                    ClothingItem.user_id == user_id,
-                    ClothingItem.is_archived == False,  # noqa: E712
+            lambda_stmt(
+                lambda: (
+                    select(ItemColorCount.color, ItemColorCount.count)
+                    .where(ItemColorCount.user_id == user_id)
+                    .order_by(ItemColorCount.count.desc())
                 )
             )
-            .group_by("color")
-            .order_by(func.count().desc())
         )
-        return [{"color": row.color, "count": row.count} for row in result.all()]
+        return [dict(row) for row in result.mappings()]
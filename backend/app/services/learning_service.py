@@ -9,20 +9,41 @@ This service implements a Netflix/Spotify-style recommendation learning system t
 5. Integrates learned preferences into the recommendation flow
 """
 
+import bisect
+import copy
+import hashlib
+import heapq
+import json
 import logging
+import time
 from datetime import UTC, datetime, timedelta
 from decimal import Decimal
 from itertools import combinations
 from uuid import UUID
 
-from sqlalchemy import and_, func, select
+from sqlalchemy import (
+    ColumnElement,
+    Float,
+    and_,
+    case,
+    cast,
+    func,
+    inspect,
+    lambda_stmt,
+    select,
+    tuple_,
+    union_all,
+    update,
+)
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, selectinload
 
 from app.models.item import ClothingItem
 from app.models.learning import (
+    ItemPairOccasionStat,
     ItemPairScore,
+    ItemPairWeatherStat,
     OutfitPerformance,
     StyleInsight,
     UserLearningProfile,
@@ -33,6 +54,134 @@ from app.utils.signed_urls import sign_image_url
 
 logger = logging.getLogger(__name__)
 
+# Temperature buckets (°C): below 5 is cold, below 15 cool, below 25 mild, else hot
+_TEMP_THRESHOLDS = (5, 15, 25)
+_TEMP_BUCKETS = ("cold", "cool", "mild", "hot")
+
+# Fixed confidences of the rule-based insights in generate_insights
+_AVOIDED_COLOR_CONFIDENCE = Decimal("0.7")
+_HIGH_ACCEPTANCE_CONFIDENCE = Decimal("0.9")
+_LOW_ACCEPTANCE_CONFIDENCE = Decimal("0.8")
+
+# Outfit slot each item type fills in OutfitPerformance.item_composition
+_TYPE_TO_CATEGORY = {
+    **dict.fromkeys(("shirt", "blouse", "t-shirt", "sweater", "top"), "top"),
+    **dict.fromkeys(("pants", "jeans", "skirt", "shorts"), "bottom"),
+    **dict.fromkeys(("sneakers", "boots", "heels", "shoes", "sandals"), "shoes"),
+    **dict.fromkeys(("jacket", "coat", "outerwear"), "outerwear"),
+}
+
+
+class InsightCache:
+    """
+    Short-lived in-memory cache of each user's active insights, as plain dicts.
+
+    The cache is per-process. Generating or acknowledging insights invalidates
+    the entry only in the process that did it; every other API process and the
+    worker keep serving their copy until the TTL runs out, so the TTL is how
+    stale a user's insights can be after a change made elsewhere.
+    """
+
+    def __init__(self, ttl_seconds: int = 30, max_entries: int = 10_000):
+        self._cache: dict[UUID, tuple[float, list[dict]]] = {}
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+
+    def get(self, user_id: UUID) -> list[dict] | None:
+        """Get a user's cached insights if not expired."""
+        entry = self._cache.get(user_id)
+        if entry is None:
+            return None
+        cached_at, insights = entry
+        if time.monotonic() - cached_at >= self._ttl:
+            del self._cache[user_id]
+            return None
+        return insights
+
+    def set(self, user_id: UUID, insights: list[dict]) -> None:
+        """Cache a user's insights, evicting the oldest entries when full."""
+        self._cache.pop(user_id, None)
+        while len(self._cache) >= self._max_entries:
+            del self._cache[next(iter(self._cache))]
+        self._cache[user_id] = (time.monotonic(), insights)
+
+    def invalidate(self, user_id: UUID) -> None:
+        """Drop a user's cached insights."""
+        self._cache.pop(user_id, None)
+
+
+_active_insights_cache = InsightCache()
+
+
+def _to_numeric(value: float | None, places: int) -> Decimal | None:
+    """Round a float score for a Numeric column with the given number of decimal places."""
+    if value is None:
+        return None
+    return Decimal(str(round(value, places)))
+
+
+def _feedback_hash(outfit: Outfit) -> str:
+    """Fingerprint the outfit status and every feedback field the learning models read."""
+    feedback = outfit.feedback
+    fields = {
+        "status": outfit.status,
+        "accepted": feedback.accepted,
+        "rating": feedback.rating,
+        "comfort_rating": feedback.comfort_rating,
+        "style_rating": feedback.style_rating,
+        "worn_at": feedback.worn_at,
+        "worn_with_modifications": feedback.worn_with_modifications,
+        "modification_notes": feedback.modification_notes,
+        "actually_worn": feedback.actually_worn,
+        "wore_instead_items": sorted(feedback.wore_instead_items or []),
+    }
+    payload = json.dumps(fields, sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def _outfit_signal() -> ColumnElement[Decimal]:
+    """
+    SQL form of LearningService._get_outfit_signal.
+
+    Evaluated over Outfit outer-joined to UserFeedback, so outfits without
+    feedback score on their status alone. Used when an outfit has no current
+    OutfitPerformance.signal; keep the two in step.
+    """
+    wore_something_else = case(
+        (
+            func.jsonb_typeof(UserFeedback.wore_instead_items) == "array",
+            func.jsonb_array_length(UserFeedback.wore_instead_items) > 0,
+        ),
+        else_=False,
+    )
+    signal = (
+        case(
+            (Outfit.status == OutfitStatus.accepted, Decimal("0.3")),
+            (Outfit.status == OutfitStatus.rejected, Decimal("-0.5")),
+            else_=Decimal("0"),
+        )
+        # Map the 1-5 rating to -1..1
+        + func.coalesce((UserFeedback.rating - 3) * Decimal("0.2"), Decimal("0"))
+        + case(
+            (
+                UserFeedback.worn_at.is_not(None),
+                case(
+                    (UserFeedback.worn_with_modifications.is_(True), Decimal("0.2")),
+                    else_=Decimal("0.3"),
+                ),
+            ),
+            else_=Decimal("0"),
+        )
+        + case(
+            (
+                UserFeedback.actually_worn.is_(False),
+                case((wore_something_else, Decimal("-0.6")), else_=Decimal("-0.4")),
+            ),
+            else_=Decimal("0"),
+        )
+    )
+    return func.greatest(Decimal("-1"), func.least(Decimal("1"), signal))
+
 
 class LearningService:
     """Service for learning from user feedback and improving recommendations."""
@@ -50,6 +199,10 @@ class LearningService:
     # Score decay for older feedback (per day)
     SCORE_DECAY_RATE = 0.995
 
+    # Pairs per statement when reading or writing pair scores in bulk; keeps a long
+    # "wore instead" list well under Postgres' 32767 bind parameter limit
+    PAIR_BATCH_SIZE = 1000
+
     def __init__(self, db: AsyncSession):
         self.db = db
 
@@ -57,6 +210,7 @@ class LearningService:
         self,
         outfit_id: UUID,
         user_id: UUID,
+        previously_responded_at: datetime | None = None,
     ) -> None:
         """
         Process new feedback and update learning models.
@@ -66,9 +220,15 @@ class LearningService:
         1. OutfitPerformance record
         2. ItemPairScore records for items in the outfit
         3. "Wore instead" items get positive signals
-        4. Triggers profile recomputation if threshold reached
+        4. The user's learning profile, incrementally for first-time feedback
+
+        previously_responded_at is when the outfit had been accepted or rejected
+        before this feedback, if it had; a full recompute since then has already
+        counted the outfit, so it must not be added to the totals again.
         """
-        # Get outfit with all related data
+        # Get outfit with all related data. The caller's session may already hold
+        # the outfit with feedback loaded as None from before the feedback was
+        # created; populate_existing makes the eager loads overwrite it
         result = await self.db.execute(
             select(Outfit)
             .where(Outfit.id == outfit_id)
@@ -76,14 +236,28 @@ class LearningService:
                 selectinload(Outfit.feedback),
                 selectinload(Outfit.items).selectinload(OutfitItem.item),
             )
+            .execution_options(populate_existing=True)
         )
         outfit = result.scalar_one_or_none()
 
         if not outfit or not outfit.feedback:
             return
 
+        # Feedback that was processed before has already been counted in the
+        # profile, so an edit needs a full recompute rather than an increment.
+        # A replay of feedback that has not changed since is skipped outright
+        feedback_hash = _feedback_hash(outfit)
+        result = await self.db.execute(
+            select(OutfitPerformance.feedback_hash).where(OutfitPerformance.outfit_id == outfit.id)
+        )
+        previous = result.one_or_none()
+        if previous is not None and previous.feedback_hash == feedback_hash:
+            logger.debug(f"Feedback for outfit {outfit_id} is unchanged, skipping")
+            return
+        is_edit = previous is not None
+
         # Update outfit performance
-        await self._update_outfit_performance(outfit)
+        await self._update_outfit_performance(outfit, feedback_hash)
 
         # Update item pair scores
         await self._update_item_pair_scores(outfit)
@@ -93,58 +267,54 @@ class LearningService:
         if outfit.feedback.wore_instead_items:
             await self._process_wore_instead(outfit)
 
+        # Update the profile straight away so the user sees it immediately
+        updated = not is_edit and await self._apply_incremental_update(
+            outfit, previously_responded_at
+        )
+
         await self.db.commit()
 
-        # Always recompute learning profile after feedback
-        # This ensures the user sees updated data immediately
-        logger.info(f"Triggering learning profile recomputation for user {user_id}")
-        await self.recompute_learning_profile(user_id)
+        if not updated:
+            logger.info(f"Triggering learning profile recomputation for user {user_id}")
+            await self.recompute_learning_profile(user_id)
 
-    async def _update_outfit_performance(self, outfit: Outfit) -> None:
+    async def _update_outfit_performance(self, outfit: Outfit, feedback_hash: str) -> None:
         """Compute and store outfit performance metrics."""
         feedback = outfit.feedback
         if not feedback:
             return
 
-        # Compute component scores
+        # Compute component scores (0-1) as floats; they become Decimals only
+        # when written to their Numeric columns
         acceptance_score = None
         if feedback.accepted is not None:
-            acceptance_score = Decimal("1.0") if feedback.accepted else Decimal("0.0")
+            acceptance_score = 1.0 if feedback.accepted else 0.0
 
         rating_score = None
         if feedback.rating is not None:
             # Normalize 1-5 rating to 0-1
-            rating_score = Decimal(str((feedback.rating - 1) / 4))
+            rating_score = (feedback.rating - 1) / 4
 
         wear_score = None
         if feedback.worn_at is not None:
             # Item was worn - good signal
-            wear_score = Decimal("1.0")
+            wear_score = 1.0
             if feedback.worn_with_modifications:
                 # Modifications suggest not perfect match
-                wear_score = Decimal("0.7")
+                wear_score = 0.7
 
         # Compute overall performance score
-        scores = []
-        weights = []
-
-        if acceptance_score is not None:
-            scores.append(float(acceptance_score))
-            weights.append(self.ACCEPTANCE_WEIGHT)
-
-        if rating_score is not None:
-            scores.append(float(rating_score))
-            weights.append(self.RATING_WEIGHT)
-
-        if wear_score is not None:
-            scores.append(float(wear_score))
-            weights.append(self.WEAR_WEIGHT)
-
-        if scores:
-            total_weight = sum(weights)
-            performance_score = (
-                sum(s * w for s, w in zip(scores, weights, strict=True)) / total_weight
+        weighted = [
+            (score, weight)
+            for score, weight in (
+                (acceptance_score, self.ACCEPTANCE_WEIGHT),
+                (rating_score, self.RATING_WEIGHT),
+                (wear_score, self.WEAR_WEIGHT),
             )
+            if score is not None
+        ]
+        if weighted:
+            performance_score = sum(s * w for s, w in weighted) / sum(w for _, w in weighted)
         else:
             performance_score = 0.5  # Neutral score if no data
 
@@ -164,14 +334,9 @@ class LearningService:
             item_type = item.type.lower() if item.type else "unknown"
 
             # Categorize by type
-            if item_type in ["shirt", "blouse", "t-shirt", "sweater", "top"]:
-                item_composition["top"] = item_type
-            elif item_type in ["pants", "jeans", "skirt", "shorts"]:
-                item_composition["bottom"] = item_type
-            elif item_type in ["sneakers", "boots", "heels", "shoes", "sandals"]:
-                item_composition["shoes"] = item_type
-            elif item_type in ["jacket", "coat", "outerwear"]:
-                item_composition["outerwear"] = item_type
+            category = _TYPE_TO_CATEGORY.get(item_type)
+            if category:
+                item_composition[category] = item_type
 
             if item.primary_color:
                 color_composition["primary_colors"].append(item.primary_color)
@@ -180,10 +345,11 @@ class LearningService:
         stmt = insert(OutfitPerformance).values(
             outfit_id=outfit.id,
             user_id=outfit.user_id,
-            performance_score=Decimal(str(performance_score)),
-            acceptance_score=acceptance_score,
-            rating_score=rating_score,
-            wear_score=wear_score,
+            performance_score=_to_numeric(performance_score, 4),
+            signal=_to_numeric(self._get_outfit_signal(outfit), 3),
+            acceptance_score=_to_numeric(acceptance_score, 4),
+            rating_score=_to_numeric(rating_score, 4),
+            wear_score=_to_numeric(wear_score, 4),
             occasion=outfit.occasion,
             weather_temp=weather_temp,
             weather_condition=weather_condition,
@@ -191,6 +357,7 @@ class LearningService:
             color_composition=color_composition,
             was_modified=feedback.worn_with_modifications,
             modification_notes=feedback.modification_notes,
+            feedback_hash=feedback_hash,
             computed_at=datetime.now(UTC),
         )
 
@@ -201,8 +368,10 @@ class LearningService:
                 "acceptance_score": stmt.excluded.acceptance_score,
                 "rating_score": stmt.excluded.rating_score,
                 "wear_score": stmt.excluded.wear_score,
+                "signal": stmt.excluded.signal,
                 "was_modified": stmt.excluded.was_modified,
                 "modification_notes": stmt.excluded.modification_notes,
+                "feedback_hash": stmt.excluded.feedback_hash,
                 "computed_at": stmt.excluded.computed_at,
             },
         )
@@ -239,30 +408,8 @@ class LearningService:
             signal_strength += 0.2
             is_positive = True
 
-        # Create all pairs (ensuring item1_id < item2_id for uniqueness)
-        for item1, item2 in combinations(items, 2):
-            id1, id2 = (item1.id, item2.id) if item1.id < item2.id else (item2.id, item1.id)
-
-            # Get or create pair score
-            result = await self.db.execute(
-                select(ItemPairScore).where(
-                    and_(
-                        ItemPairScore.user_id == outfit.user_id,
-                        ItemPairScore.item1_id == id1,
-                        ItemPairScore.item2_id == id2,
-                    )
-                )
-            )
-            pair_score = result.scalar_one_or_none()
-
-            if not pair_score:
-                pair_score = ItemPairScore(
-                    user_id=outfit.user_id,
-                    item1_id=id1,
-                    item2_id=id2,
-                )
-                self.db.add(pair_score)
-
+        pair_scores = await self._get_pair_scores(outfit.user_id, [item.id for item in items])
+        for pair_score in pair_scores:
             # Update counts
             pair_score.times_paired += 1
 
@@ -275,38 +422,27 @@ class LearningService:
                 pair_score.total_rating_sum += feedback.rating
                 pair_score.rating_count += 1
 
-            # Update occasion performance
-            occasion = outfit.occasion
-            occasion_perf = (
-                dict(pair_score.occasion_performance) if pair_score.occasion_performance else {}
-            )
-            if occasion not in occasion_perf:
-                occasion_perf[occasion] = {"count": 0, "positive": 0}
-            occasion_perf[occasion]["count"] += 1
-            if is_positive:
-                occasion_perf[occasion]["positive"] += 1
-            pair_score.occasion_performance = occasion_perf
-
-            # Update weather performance
-            if outfit.weather_data:
-                temp = outfit.weather_data.get("temperature")
-                if temp is not None:
-                    temp_bucket = self._get_temp_bucket(temp)
-                    weather_perf = (
-                        dict(pair_score.weather_performance)
-                        if pair_score.weather_performance
-                        else {}
-                    )
-                    if temp_bucket not in weather_perf:
-                        weather_perf[temp_bucket] = {"count": 0, "positive": 0}
-                    weather_perf[temp_bucket]["count"] += 1
-                    if is_positive:
-                        weather_perf[temp_bucket]["positive"] += 1
-                    pair_score.weather_performance = weather_perf
-
             # Recompute compatibility score
             pair_score.compatibility_score = self._compute_pair_compatibility(pair_score)
 
+        # Existing pairs were updated in place; autoflush is off, so the commit
+        # flushes them together as executemany UPDATEs instead of one per pair
+        await self._insert_new_pair_scores(pair_scores)
+
+        # Track which occasions and weather each pair works well in
+        await self._count_pair_context(
+            ItemPairOccasionStat, {"occasion": outfit.occasion}, pair_scores, is_positive
+        )
+        if outfit.weather_data:
+            temp = outfit.weather_data.get("temperature")
+            if temp is not None:
+                await self._count_pair_context(
+                    ItemPairWeatherStat,
+                    {"temp_bucket": self._get_temp_bucket(temp)},
+                    pair_scores,
+                    is_positive,
+                )
+
     async def _process_wore_instead(self, outfit: Outfit) -> None:
         """
         Process items the user wore instead of the recommendation.
@@ -326,44 +462,23 @@ class LearningService:
             # Need at least 2 items to form a pair
             return
 
-        # Get the actual items
+        # Keep only items that still exist; only their ids are needed for the pairs
         result = await self.db.execute(
-            select(ClothingItem).where(ClothingItem.id.in_(wore_instead_ids))
+            select(ClothingItem.id).where(ClothingItem.id.in_(wore_instead_ids))
         )
-        wore_items = list(result.scalars().all())
+        wore_item_ids = list(result.scalars().all())
 
-        if len(wore_items) < 2:
+        if len(wore_item_ids) < 2:
             return
 
         logger.info(
-            f"Processing 'wore instead' items for user {outfit.user_id}: {len(wore_items)} items"
+            f"Processing 'wore instead' items for user {outfit.user_id}: {len(wore_item_ids)} items"
         )
 
         # Create positive pair scores for items they actually wore
         # These get a strong positive signal since user actively chose them
-        for item1, item2 in combinations(wore_items, 2):
-            id1, id2 = (item1.id, item2.id) if item1.id < item2.id else (item2.id, item1.id)
-
-            # Get or create pair score
-            result = await self.db.execute(
-                select(ItemPairScore).where(
-                    and_(
-                        ItemPairScore.user_id == outfit.user_id,
-                        ItemPairScore.item1_id == id1,
-                        ItemPairScore.item2_id == id2,
-                    )
-                )
-            )
-            pair_score = result.scalar_one_or_none()
-
-            if not pair_score:
-                pair_score = ItemPairScore(
-                    user_id=outfit.user_id,
-                    item1_id=id1,
-                    item2_id=id2,
-                )
-                self.db.add(pair_score)
-
+        pair_scores = await self._get_pair_scores(outfit.user_id, wore_item_ids)
+        for pair_score in pair_scores:
             # Strong positive signal - user chose this over our recommendation
             pair_score.times_paired += 1
             pair_score.times_accepted += 1  # Treat as accepted since user chose it
@@ -375,16 +490,124 @@ class LearningService:
             # Recompute compatibility
             pair_score.compatibility_score = self._compute_pair_compatibility(pair_score)
 
+        await self._insert_new_pair_scores(pair_scores)
+
+    async def _get_pair_scores(
+        self,
+        user_id: UUID,
+        item_ids: list[UUID],
+    ) -> list[ItemPairScore]:
+        """
+        Get the pair score for every pair of items, loading existing rows in bulk.
+
+        Pairs without a row get a new, zeroed ItemPairScore that is not added to the
+        session; _insert_new_pair_scores writes those once they have been updated.
+        """
+        # combinations keeps input order, so pairs of the sorted ids already have
+        # item1_id < item2_id as the unique constraint expects
+        pairs = list(combinations(sorted(set(item_ids)), 2))
+        if not pairs:
+            return []
+
+        existing = {}
+        for start in range(0, len(pairs), self.PAIR_BATCH_SIZE):
+            result = await self.db.execute(
+                select(ItemPairScore).where(
+                    ItemPairScore.user_id == user_id,
+                    tuple_(ItemPairScore.item1_id, ItemPairScore.item2_id).in_(
+                        pairs[start : start + self.PAIR_BATCH_SIZE]
+                    ),
+                )
+            )
+            existing.update({(ps.item1_id, ps.item2_id): ps for ps in result.scalars()})
+
+        return [
+            existing.get(pair)
+            or ItemPairScore(
+                user_id=user_id,
+                item1_id=pair[0],
+                item2_id=pair[1],
+                compatibility_score=Decimal("0.0"),
+                times_paired=0,
+                times_accepted=0,
+                times_rejected=0,
+                total_rating_sum=0,
+                rating_count=0,
+            )
+            for pair in pairs
+        ]
+
+    async def _insert_new_pair_scores(self, pair_scores: list[ItemPairScore]) -> None:
+        """Insert the pair scores created by _get_pair_scores with multi-row upserts."""
+        rows = [
+            {
+                "user_id": ps.user_id,
+                "item1_id": ps.item1_id,
+                "item2_id": ps.item2_id,
+                "compatibility_score": ps.compatibility_score,
+                "times_paired": ps.times_paired,
+                "times_accepted": ps.times_accepted,
+                "times_rejected": ps.times_rejected,
+                "total_rating_sum": ps.total_rating_sum,
+                "rating_count": ps.rating_count,
+            }
+            for ps in pair_scores
+            if inspect(ps).transient
+        ]
+
+        for start in range(0, len(rows), self.PAIR_BATCH_SIZE):
+            stmt = insert(ItemPairScore).values(rows[start : start + self.PAIR_BATCH_SIZE])
+            # Only reached when concurrent feedback created the pair after it was read;
+            # the counters are merged and the score takes this feedback's value
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_user_item_pair",
+                set_={
+                    "compatibility_score": stmt.excluded.compatibility_score,
+                    "times_paired": ItemPairScore.times_paired + stmt.excluded.times_paired,
+                    "times_accepted": ItemPairScore.times_accepted + stmt.excluded.times_accepted,
+                    "times_rejected": ItemPairScore.times_rejected + stmt.excluded.times_rejected,
+                    "total_rating_sum": ItemPairScore.total_rating_sum
+                    + stmt.excluded.total_rating_sum,
+                    "rating_count": ItemPairScore.rating_count + stmt.excluded.rating_count,
+                    "updated_at": func.now(),
+                },
+            )
+            await self.db.execute(stmt)
+
+    async def _count_pair_context(
+        self,
+        model: type[ItemPairOccasionStat] | type[ItemPairWeatherStat],
+        context: dict[str, str],
+        pair_scores: list[ItemPairScore],
+        is_positive: bool,
+    ) -> None:
+        """Add one outfit, positive or not, to each pair's stats row for a context."""
+        rows = [
+            {
+                "user_id": ps.user_id,
+                "item1_id": ps.item1_id,
+                "item2_id": ps.item2_id,
+                **context,
+                "count": 1,
+                "positive": int(is_positive),
+            }
+            for ps in pair_scores
+        ]
+
+        for start in range(0, len(rows), self.PAIR_BATCH_SIZE):
+            stmt = insert(model).values(rows[start : start + self.PAIR_BATCH_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=list(model.__table__.primary_key),
+                set_={
+                    "count": model.count + stmt.excluded.count,
+                    "positive": model.positive + stmt.excluded.positive,
+                },
+            )
+            await self.db.execute(stmt)
+
     def _get_temp_bucket(self, temp: float) -> str:
         """Get temperature bucket for grouping."""
-        if temp < 5:
-            return "cold"
-        elif temp < 15:
-            return "cool"
-        elif temp < 25:
-            return "mild"
-        else:
-            return "hot"
+        return _TEMP_BUCKETS[bisect.bisect_right(_TEMP_THRESHOLDS, temp)]
 
     def _compute_pair_compatibility(self, pair: ItemPairScore) -> Decimal:
         """Compute overall compatibility score for an item pair."""
@@ -408,7 +631,7 @@ class LearningService:
         # Combine scores
         score = (acceptance_rate * 0.6 + rating_score * 0.4) * 2 - 1  # Scale to -1 to 1
 
-        return Decimal(str(round(score, 4)))
+        return _to_numeric(score, 4)
 
     async def _get_feedback_count(self, user_id: UUID) -> int:
         """Get total feedback count for a user."""
@@ -430,163 +653,292 @@ class LearningService:
         """
         logger.info(f"Recomputing learning profile for user {user_id}")
 
-        # Get all feedbacks with outfit details
-        result = await self.db.execute(
-            select(Outfit)
+        # Score every accepted/rejected outfit in SQL; the aggregates below read
+        # from this instead of loading each outfit, its feedback and its items
+        scored = (
+            select(
+                Outfit.id.label("outfit_id"),
+                Outfit.status,
+                Outfit.occasion,
+                Outfit.weather_data,
+                # The signal stored with the outfit's performance, unless the outfit
+                # was accepted or rejected again after that was computed
+                func.coalesce(
+                    case(
+                        (
+                            OutfitPerformance.computed_at >= Outfit.responded_at,
+                            OutfitPerformance.signal,
+                        ),
+                    ),
+                    _outfit_signal(),
+                ).label("signal"),
+                UserFeedback.rating,
+                UserFeedback.comfort_rating,
+                UserFeedback.style_rating,
+            )
+            .outerjoin(UserFeedback, UserFeedback.outfit_id == Outfit.id)
+            .outerjoin(OutfitPerformance, OutfitPerformance.outfit_id == Outfit.id)
             .where(
                 and_(
                     Outfit.user_id == user_id,
                     Outfit.status.in_([OutfitStatus.accepted, OutfitStatus.rejected]),
                 )
             )
-            .options(
-                selectinload(Outfit.feedback),
-                selectinload(Outfit.items).selectinload(OutfitItem.item),
-            )
+            .cte("scored")
+        )
+        is_positive = scored.c.signal > 0
+
+        # Per-occasion outcomes, which also add up to the overall statistics
+        result = await self.db.execute(
+            select(
+                scored.c.occasion,
+                func.count().label("count"),
+                func.count().filter(is_positive).label("positive"),
+                func.count().filter(scored.c.status == OutfitStatus.accepted).label("accepted"),
+                func.count(scored.c.rating).label("rating_count"),
+                func.coalesce(func.sum(scored.c.rating), 0).label("rating_sum"),
+                func.count(scored.c.comfort_rating).label("comfort_count"),
+                func.coalesce(func.sum(scored.c.comfort_rating), 0).label("comfort_sum"),
+                func.count(scored.c.style_rating).label("style_count"),
+                func.coalesce(func.sum(scored.c.style_rating), 0).label("style_sum"),
+            ).group_by(scored.c.occasion)
         )
-        outfits = list(result.scalars().all())
+        occasion_rows = result.all()
 
-        if len(outfits) < self.MIN_FEEDBACK_FOR_LEARNING:
-            logger.info(f"Not enough feedback for user {user_id} ({len(outfits)} outfits)")
+        total_outfits = sum(row.count for row in occasion_rows)
+        if total_outfits < self.MIN_FEEDBACK_FOR_LEARNING:
+            logger.info(f"Not enough feedback for user {user_id} ({total_outfits} outfits)")
             return await self._get_or_create_profile(user_id)
 
-        # Initialize accumulators
-        color_scores: dict[str, list[float]] = {}
-        style_scores: dict[str, list[float]] = {}
-        occasion_patterns: dict[str, dict] = {}
-        weather_prefs: dict[str, dict] = {}
-
-        total_accepted = 0
-        total_rejected = 0
-        rating_sum = 0
-        rating_count = 0
-        comfort_sum = 0
-        comfort_count = 0
-        style_sum = 0
-        style_count = 0
-
-        for outfit in outfits:
-            # Determine signal from this outfit
-            signal = self._get_outfit_signal(outfit)
-
-            # Extract features
-            for oi in outfit.items:
-                item = oi.item
-
-                # Color signals
-                if item.primary_color:
-                    if item.primary_color not in color_scores:
-                        color_scores[item.primary_color] = []
-                    color_scores[item.primary_color].append(signal)
-
-                # Style signals
-                for style in item.style or []:
-                    if style not in style_scores:
-                        style_scores[style] = []
-                    style_scores[style].append(signal)
-
-            # Occasion patterns
-            occasion = outfit.occasion
-            if occasion not in occasion_patterns:
-                occasion_patterns[occasion] = {
-                    "colors": {},
-                    "formality": {},
-                    "count": 0,
-                    "positive": 0,
-                }
-            occasion_patterns[occasion]["count"] += 1
-            if signal > 0:
-                occasion_patterns[occasion]["positive"] += 1
-
-            # Track colors per occasion
-            for oi in outfit.items:
-                if oi.item.primary_color:
-                    color = oi.item.primary_color
-                    if color not in occasion_patterns[occasion]["colors"]:
-                        occasion_patterns[occasion]["colors"][color] = 0
-                    if signal > 0:
-                        occasion_patterns[occasion]["colors"][color] += 1
-
-            # Weather preferences
-            if outfit.weather_data:
-                temp = outfit.weather_data.get("temperature")
-                if temp is not None:
-                    bucket = self._get_temp_bucket(temp)
-                    if bucket not in weather_prefs:
-                        weather_prefs[bucket] = {"count": 0, "positive": 0, "layers": []}
-                    weather_prefs[bucket]["count"] += 1
-                    if signal > 0:
-                        weather_prefs[bucket]["positive"] += 1
-                    weather_prefs[bucket]["layers"].append(len(outfit.items))
-
-            # Aggregate statistics
-            if outfit.status == OutfitStatus.accepted:
-                total_accepted += 1
-            else:
-                total_rejected += 1
-
-            if outfit.feedback:
-                if outfit.feedback.rating is not None:
-                    rating_sum += outfit.feedback.rating
-                    rating_count += 1
-                if outfit.feedback.comfort_rating is not None:
-                    comfort_sum += outfit.feedback.comfort_rating
-                    comfort_count += 1
-                if outfit.feedback.style_rating is not None:
-                    style_sum += outfit.feedback.style_rating
-                    style_count += 1
-
-        # Compute final scores
-        # Lower threshold (1) to show data early; quality improves with more feedback
-        learned_color_scores = {}
-        for color, signals in color_scores.items():
-            if len(signals) >= 1:
-                learned_color_scores[color] = round(sum(signals) / len(signals), 3)
+        totals: dict = {
+            "outfits": total_outfits,
+            "accepted": sum(row.accepted for row in occasion_rows),
+            "rating_sum": sum(row.rating_sum for row in occasion_rows),
+            "rating_count": sum(row.rating_count for row in occasion_rows),
+            "comfort_sum": sum(row.comfort_sum for row in occasion_rows),
+            "comfort_count": sum(row.comfort_count for row in occasion_rows),
+            "style_sum": sum(row.style_sum for row in occasion_rows),
+            "style_count": sum(row.style_count for row in occasion_rows),
+            "colors": {},
+            "styles": {},
+            "occasions": {
+                row.occasion: {"count": row.count, "positive": row.positive, "colors": {}}
+                for row in occasion_rows
+            },
+            "weather": {},
+        }
 
-        learned_style_scores = {}
-        for style, signals in style_scores.items():
-            if len(signals) >= 1:
-                learned_style_scores[style] = round(sum(signals) / len(signals), 3)
+        # Color signals, split by occasion so the same rows give per-occasion colors
+        result = await self.db.execute(
+            select(
+                scored.c.occasion,
+                ClothingItem.primary_color,
+                func.count().label("count"),
+                func.sum(scored.c.signal).label("signal_sum"),
+                func.count().filter(is_positive).label("positive"),
+            )
+            .select_from(scored)
+            .join(OutfitItem, OutfitItem.outfit_id == scored.c.outfit_id)
+            .join(ClothingItem, ClothingItem.id == OutfitItem.item_id)
+            .where(ClothingItem.primary_color.is_not(None), ClothingItem.primary_color != "")
+            .group_by(scored.c.occasion, ClothingItem.primary_color)
+        )
+        for row in result:
+            color = totals["colors"].setdefault(row.primary_color, {"sum": 0.0, "count": 0})
+            color["sum"] += float(row.signal_sum)
+            color["count"] += row.count
+            totals["occasions"][row.occasion]["colors"][row.primary_color] = row.positive
+
+        # Style signals; each item's style array is unnested to one row per style
+        item_styles = (
+            select(func.unnest(ClothingItem.style).label("style"), scored.c.signal)
+            .select_from(scored)
+            .join(OutfitItem, OutfitItem.outfit_id == scored.c.outfit_id)
+            .join(ClothingItem, ClothingItem.id == OutfitItem.item_id)
+            .subquery()
+        )
+        result = await self.db.execute(
+            select(
+                item_styles.c.style,
+                func.count().label("count"),
+                func.sum(item_styles.c.signal).label("signal_sum"),
+            ).group_by(item_styles.c.style)
+        )
+        totals["styles"] = {
+            row.style: {"sum": float(row.signal_sum), "count": row.count} for row in result
+        }
+
+        # Weather buckets, with the outfit's item count as its number of layers
+        temperature = cast(scored.c.weather_data["temperature"].astext, Float)
+        weather = (
+            select(
+                case(
+                    *(
+                        (temperature < threshold, bucket)
+                        for threshold, bucket in zip(_TEMP_THRESHOLDS, _TEMP_BUCKETS, strict=False)
+                    ),
+                    else_=_TEMP_BUCKETS[-1],
+                ).label("bucket"),
+                scored.c.signal,
+                select(func.count())
+                .where(OutfitItem.outfit_id == scored.c.outfit_id)
+                .scalar_subquery()
+                .label("layers"),
+            )
+            .where(temperature.is_not(None))
+            .subquery()
+        )
+        result = await self.db.execute(
+            select(
+                weather.c.bucket,
+                func.count().label("count"),
+                func.count().filter(weather.c.signal > 0).label("positive"),
+                func.sum(weather.c.layers).label("layers"),
+            ).group_by(weather.c.bucket)
+        )
+        totals["weather"] = {
+            row.bucket: {"count": row.count, "positive": row.positive, "layers": int(row.layers)}
+            for row in result
+        }
+
+        # Update or create profile
+        profile = await self._get_or_create_profile(user_id)
+        self._apply_learning_totals(profile, totals)
+        profile.last_computed_at = datetime.now(UTC)
+
+        await self.db.commit()
+        await self.db.refresh(profile)
+
+        logger.info(f"Learning profile updated for user {user_id}")
+
+        return profile
+
+    async def _apply_incremental_update(
+        self, outfit: Outfit, previously_responded_at: datetime | None = None
+    ) -> bool:
+        """
+        Add a newly responded outfit to the user's learning totals.
+
+        Only valid for an outfit whose feedback has not been counted before.
+        Returns False when the profile has no totals yet, or when the last full
+        recompute already counted the outfit because it had been accepted or
+        rejected by then; the caller should run a full recompute instead.
+        last_computed_at is left alone so the periodic job still rebuilds the
+        profile from scratch.
+        """
+        profile = await self._get_or_create_profile(outfit.user_id)
+        if not profile.learning_totals:
+            return False
+        if (
+            previously_responded_at is not None
+            and profile.last_computed_at is not None
+            and previously_responded_at <= profile.last_computed_at
+        ):
+            return False
+
+        # Outfits count once they are accepted or rejected, as in the full recompute
+        if outfit.status not in (OutfitStatus.accepted, OutfitStatus.rejected):
+            return True
+
+        totals = copy.deepcopy(profile.learning_totals)
+        signal = round(self._get_outfit_signal(outfit), 3)
+        is_positive = signal > 0
+
+        totals["outfits"] += 1
+        if outfit.status == OutfitStatus.accepted:
+            totals["accepted"] += 1
+
+        feedback = outfit.feedback
+        for attr, key in (
+            ("rating", "rating"),
+            ("comfort_rating", "comfort"),
+            ("style_rating", "style"),
+        ):
+            value = getattr(feedback, attr)
+            if value is not None:
+                totals[f"{key}_sum"] += value
+                totals[f"{key}_count"] += 1
+
+        occasion = totals["occasions"].setdefault(
+            outfit.occasion, {"count": 0, "positive": 0, "colors": {}}
+        )
+        occasion["count"] += 1
+        occasion["positive"] += int(is_positive)
+
+        for oi in outfit.items:
+            item = oi.item
+            if item.primary_color:
+                color = totals["colors"].setdefault(item.primary_color, {"sum": 0.0, "count": 0})
+                color["sum"] += signal
+                color["count"] += 1
+                occasion["colors"].setdefault(item.primary_color, 0)
+                occasion["colors"][item.primary_color] += int(is_positive)
+            for style in item.style or []:
+                style_total = totals["styles"].setdefault(style, {"sum": 0.0, "count": 0})
+                style_total["sum"] += signal
+                style_total["count"] += 1
+
+        if outfit.weather_data:
+            temp = outfit.weather_data.get("temperature")
+            if temp is not None:
+                bucket = totals["weather"].setdefault(
+                    self._get_temp_bucket(temp), {"count": 0, "positive": 0, "layers": 0}
+                )
+                bucket["count"] += 1
+                bucket["positive"] += int(is_positive)
+                bucket["layers"] += len(outfit.items)
+
+        self._apply_learning_totals(profile, totals)
+        return True
+
+    def _apply_learning_totals(self, profile: UserLearningProfile, totals: dict) -> None:
+        """Store learning totals on a profile and derive its learned scores from them."""
+        profile.learning_totals = totals
+
+        # Lower threshold (1) to show data early; quality improves with more feedback
+        profile.learned_color_scores = {
+            color: round(data["sum"] / data["count"], 3)
+            for color, data in totals["colors"].items()
+            if data["count"] >= 1
+        }
+        profile.learned_style_scores = {
+            style: round(data["sum"] / data["count"], 3)
+            for style, data in totals["styles"].items()
+            if data["count"] >= 1
+        }
 
         # Simplify occasion patterns
         learned_occasion_patterns = {}
-        for occasion, data in occasion_patterns.items():
+        for occasion, data in totals["occasions"].items():
             if data["count"] >= 1:
                 # Find most successful colors for this occasion
-                top_colors = sorted(
-                    data["colors"].items(),
-                    key=lambda x: x[1],
-                    reverse=True,
-                )[:3]
+                top_colors = heapq.nlargest(3, data["colors"].items(), key=lambda x: x[1])
                 learned_occasion_patterns[occasion] = {
                     "preferred_colors": [c for c, _ in top_colors],
                     "success_rate": round(data["positive"] / data["count"], 2),
                 }
+        profile.learned_occasion_patterns = learned_occasion_patterns
 
         # Simplify weather preferences
         learned_weather_prefs = {}
-        for bucket, data in weather_prefs.items():
+        for bucket, data in totals["weather"].items():
             if data["count"] >= 1:
-                avg_layers = sum(data["layers"]) / len(data["layers"])
                 learned_weather_prefs[bucket] = {
-                    "preferred_layers": round(avg_layers, 1),
+                    "preferred_layers": round(data["layers"] / data["count"], 1),
                     "success_rate": round(data["positive"] / data["count"], 2),
                 }
+        profile.learned_weather_preferences = learned_weather_prefs
 
         # Compute rates
-        total_responded = total_accepted + total_rejected
-        acceptance_rate = total_accepted / total_responded if total_responded > 0 else None
-        avg_rating = rating_sum / rating_count if rating_count > 0 else None
-        avg_comfort = comfort_sum / comfort_count if comfort_count > 0 else None
-        avg_style = style_sum / style_count if style_count > 0 else None
+        total_responded = totals["outfits"]
+        acceptance_rate = totals["accepted"] / total_responded if total_responded > 0 else None
+        rating_count = totals["rating_count"]
+        avg_rating = totals["rating_sum"] / rating_count if rating_count > 0 else None
+        comfort_count = totals["comfort_count"]
+        avg_comfort = totals["comfort_sum"] / comfort_count if comfort_count > 0 else None
+        style_count = totals["style_count"]
+        avg_style = totals["style_sum"] / style_count if style_count > 0 else None
 
-        # Update or create profile
-        profile = await self._get_or_create_profile(user_id)
-
-        profile.learned_color_scores = learned_color_scores
-        profile.learned_style_scores = learned_style_scores
-        profile.learned_occasion_patterns = learned_occasion_patterns
-        profile.learned_weather_preferences = learned_weather_prefs
         profile.overall_acceptance_rate = (
             Decimal(str(round(acceptance_rate, 4))) if acceptance_rate else None
         )
@@ -595,16 +947,8 @@ class LearningService:
             Decimal(str(round(avg_comfort, 2))) if avg_comfort else None
         )
         profile.average_style_rating = Decimal(str(round(avg_style, 2))) if avg_style else None
-        profile.feedback_count = len(outfits)
+        profile.feedback_count = total_responded
         profile.outfits_rated = rating_count
-        profile.last_computed_at = datetime.now(UTC)
-
-        await self.db.commit()
-        await self.db.refresh(profile)
-
-        logger.info(f"Learning profile updated for user {user_id}")
-
-        return profile
 
     def _get_outfit_signal(self, outfit: Outfit) -> float:
         """Get a normalized signal (-1 to 1) from outfit feedback."""
@@ -636,10 +980,9 @@ class LearningService:
 
     async def _get_or_create_profile(self, user_id: UUID) -> UserLearningProfile:
         """Get existing profile or create a new one."""
-        result = await self.db.execute(
-            select(UserLearningProfile).where(UserLearningProfile.user_id == user_id)
-        )
-        profile = result.scalar_one_or_none()
+        # user_id is the primary key, so a profile this session already loaded
+        # comes from the identity map without another SELECT
+        profile = await self.db.get(UserLearningProfile, user_id)
 
         if not profile:
             profile = UserLearningProfile(user_id=user_id)
@@ -659,48 +1002,41 @@ class LearningService:
 
         Returns list of (item, compatibility_score) tuples.
         """
-        # Find pairs involving this item with positive scores
-        result = await self.db.execute(
-            select(ItemPairScore)
-            .where(
-                and_(
+
+        # Find pairs involving this item with positive scores. The item can be on
+        # either side of a pair, so each side is its own (user_id, itemN_id, score)
+        # index scan rather than one OR that needs a bitmap of both indexes.
+        # Archived partners are skipped inside each side so the limit still holds
+        def pairs_where(own_id, other_id):
+            return (
+                select(
+                    other_id.label("other_id"),
+                    ItemPairScore.compatibility_score.label("score"),
+                )
+                .join(ClothingItem, ClothingItem.id == other_id)
+                .where(
                     ItemPairScore.user_id == user_id,
+                    own_id == item_id,
                     ItemPairScore.compatibility_score > 0,
-                    (ItemPairScore.item1_id == item_id) | (ItemPairScore.item2_id == item_id),
+                    ClothingItem.is_archived.is_(False),
                 )
+                .order_by(ItemPairScore.compatibility_score.desc())
+                .limit(limit)
             )
-            .order_by(ItemPairScore.compatibility_score.desc())
-            .limit(limit * 2)  # Fetch extra in case some items are unavailable
-        )
-        pairs = list(result.scalars().all())
-
-        # Get the paired item IDs
-        paired_ids = []
-        scores = {}
-        for pair in pairs:
-            other_id = pair.item2_id if pair.item1_id == item_id else pair.item1_id
-            paired_ids.append(other_id)
-            scores[other_id] = float(pair.compatibility_score)
 
-        if not paired_ids:
-            return []
+        pairs = union_all(
+            pairs_where(ItemPairScore.item1_id, ItemPairScore.item2_id),
+            pairs_where(ItemPairScore.item2_id, ItemPairScore.item1_id),
+        ).subquery()
 
-        # Fetch the items
+        # Load the paired items with their scores in the same query
         result = await self.db.execute(
-            select(ClothingItem).where(
-                and_(
-                    ClothingItem.id.in_(paired_ids),
-                    ClothingItem.is_archived.is_(False),
-                )
-            )
+            select(ClothingItem, pairs.c.score)
+            .join(pairs, ClothingItem.id == pairs.c.other_id)
+            .order_by(pairs.c.score.desc())
+            .limit(limit)
         )
-        items = list(result.scalars().all())
-
-        # Return with scores
-        suggestions = [(item, scores[item.id]) for item in items if item.id in scores]
-        suggestions.sort(key=lambda x: x[1], reverse=True)
-
-        return suggestions[:limit]
+        return [(item, float(score)) for item, score in result]
 
     async def get_learned_preferences(
         self,
@@ -720,15 +1056,16 @@ class LearningService:
 
         # Top liked colors
         if profile.learned_color_scores:
-            liked_colors = sorted(
-                [(c, s) for c, s in profile.learned_color_scores.items() if s > 0.2],
+            liked_colors = heapq.nlargest(
+                5,
+                ((c, s) for c, s in profile.learned_color_scores.items() if s > 0.2),
                 key=lambda x: x[1],
-                reverse=True,
-            )[:5]
-            disliked_colors = sorted(
-                [(c, s) for c, s in profile.learned_color_scores.items() if s < -0.2],
+            )
+            disliked_colors = heapq.nsmallest(
+                3,
+                ((c, s) for c, s in profile.learned_color_scores.items() if s < -0.2),
                 key=lambda x: x[1],
-            )[:3]
+            )
 
             if liked_colors:
                 preferences["learned_favorite_colors"] = [c for c, _ in liked_colors]
@@ -737,11 +1074,11 @@ class LearningService:
 
         # Top liked styles
         if profile.learned_style_scores:
-            liked_styles = sorted(
-                [(s, score) for s, score in profile.learned_style_scores.items() if score > 0.2],
+            liked_styles = heapq.nlargest(
+                3,
+                ((s, score) for s, score in profile.learned_style_scores.items() if score > 0.2),
                 key=lambda x: x[1],
-                reverse=True,
-            )[:3]
+            )
             if liked_styles:
                 preferences["learned_preferred_styles"] = [s for s, _ in liked_styles]
 
@@ -768,11 +1105,8 @@ class LearningService:
 
         # Color insights
         if profile.learned_color_scores:
-            top_colors = sorted(
-                profile.learned_color_scores.items(),
-                key=lambda x: x[1],
-                reverse=True,
-            )
+            # Only the best color is reported
+            top_colors = heapq.nlargest(1, profile.learned_color_scores.items(), key=lambda x: x[1])
 
             if top_colors and top_colors[0][1] > 0.3:
                 best_color = top_colors[0][0]
@@ -783,7 +1117,7 @@ class LearningService:
                         insight_type="positive",
                         title=f"You love {best_color}!",
                         description=f"Your feedback shows a strong preference for {best_color} items. We'll prioritize these in your recommendations.",
-                        confidence=Decimal(str(min(0.95, abs(top_colors[0][1])))),
+                        confidence=_to_numeric(min(0.95, abs(top_colors[0][1])), 4),
                         supporting_data={"color": best_color, "score": top_colors[0][1]},
                         expires_at=expiry,
                     )
@@ -799,7 +1133,7 @@ class LearningService:
                         insight_type="negative",
                         title=f"Not a fan of {avoided[0]}",
                         description=f"You tend to reject outfits with {avoided[0]}. We'll suggest alternatives.",
-                        confidence=Decimal("0.7"),
+                        confidence=_AVOIDED_COLOR_CONFIDENCE,
                         supporting_data={"colors": avoided},
                         expires_at=expiry,
                     )
@@ -816,7 +1150,7 @@ class LearningService:
                         insight_type="positive",
                         title="Great match!",
                         description=f"You accept {rate * 100:.0f}% of our suggestions. We're learning your style well!",
-                        confidence=Decimal("0.9"),
+                        confidence=_HIGH_ACCEPTANCE_CONFIDENCE,
                         supporting_data={"acceptance_rate": rate},
                         expires_at=expiry,
                     )
@@ -829,7 +1163,7 @@ class LearningService:
                         insight_type="suggestion",
                         title="Help us learn your style",
                         description="You've rejected many suggestions. Consider updating your preferences to help us improve.",
-                        confidence=Decimal("0.8"),
+                        confidence=_LOW_ACCEPTANCE_CONFIDENCE,
                         supporting_data={"acceptance_rate": rate},
                         expires_at=expiry,
                     )
@@ -837,11 +1171,7 @@ class LearningService:
 
         # Style insights
         if profile.learned_style_scores:
-            top_styles = sorted(
-                profile.learned_style_scores.items(),
-                key=lambda x: x[1],
-                reverse=True,
-            )[:2]
+            top_styles = heapq.nlargest(2, profile.learned_style_scores.items(), key=lambda x: x[1])
             if top_styles and top_styles[0][1] > 0.2:
                 insights.append(
                     StyleInsight(
@@ -850,58 +1180,90 @@ class LearningService:
                         insight_type="pattern",
                         title=f"Your style: {top_styles[0][0]}",
                         description=f"Based on your feedback, you gravitate towards {', '.join(s for s, _ in top_styles)} styles.",
-                        confidence=Decimal(str(min(0.9, abs(top_styles[0][1])))),
+                        confidence=_to_numeric(min(0.9, abs(top_styles[0][1])), 4),
                         supporting_data={"styles": dict(top_styles)},
                         expires_at=expiry,
                     )
                 )
 
+        # Nothing to write, so skip the transaction
+        if not insights:
+            return insights
+
         # Save insights to database
-        for insight in insights:
-            self.db.add(insight)
+        self.db.add_all(insights)
 
         await self.db.commit()
+        _active_insights_cache.invalidate(user_id)
 
         return insights
 
-    async def get_active_insights(self, user_id: UUID) -> list[StyleInsight]:
-        """Get all active (non-expired, non-acknowledged) insights for a user."""
+    async def get_active_insights(self, user_id: UUID) -> list[dict]:
+        """
+        Get all active (non-expired, non-acknowledged) insights for a user.
+
+        Each insight is a dict of its id, category, insight_type, title,
+        description, confidence, created_at and expires_at; being plain data,
+        the cached copies are not tied to any session.
+        """
         now = datetime.now(UTC)
 
+        cached = _active_insights_cache.get(user_id)
+        if cached is not None:
+            # Insights can expire while cached
+            return [i for i in cached if i["expires_at"] is None or i["expires_at"] > now]
+
+        # lambda_stmt caches the built statement for this polled, fixed-shape query
         result = await self.db.execute(
-            select(StyleInsight)
-            .where(
-                and_(
-                    StyleInsight.user_id == user_id,
-                    StyleInsight.is_acknowledged.is_(False),
-                    (StyleInsight.expires_at.is_(None)) | (StyleInsight.expires_at > now),
+            lambda_stmt(
+                lambda: (
+                    select(
+                        StyleInsight.id,
+                        StyleInsight.category,
+                        StyleInsight.insight_type,
+                        StyleInsight.title,
+                        StyleInsight.description,
+                        StyleInsight.confidence,
+                        StyleInsight.created_at,
+                        StyleInsight.expires_at,
+                    )
+                    .where(
+                        and_(
+                            StyleInsight.user_id == user_id,
+                            # Written as NOT is_acknowledged to match the partial index
+                            ~StyleInsight.is_acknowledged,
+                            (StyleInsight.expires_at.is_(None)) | (StyleInsight.expires_at > now),
+                        )
+                    )
+                    .order_by(StyleInsight.created_at.desc())
                 )
             )
-            .order_by(StyleInsight.created_at.desc())
         )
+        insights = [dict(row) for row in result.mappings()]
+        _active_insights_cache.set(user_id, insights)
 
-        return list(result.scalars().all())
+        return insights
 
     async def acknowledge_insight(self, user_id: UUID, insight_id: UUID) -> bool:
         """Mark an insight as acknowledged by the user."""
+        # A single UPDATE ... RETURNING both checks ownership and writes the change
         result = await self.db.execute(
-            select(StyleInsight).where(
+            update(StyleInsight)
+            .where(
                 and_(
                     StyleInsight.id == insight_id,
                     StyleInsight.user_id == user_id,
                 )
             )
+            .values(is_acknowledged=True, acknowledged_at=datetime.now(UTC))
+            .returning(StyleInsight.id)
         )
-        insight = result.scalar_one_or_none()
-
-        if not insight:
-            return False
-
-        insight.is_acknowledged = True
-        insight.acknowledged_at = datetime.now(UTC)
+        acknowledged = result.first() is not None
         await self.db.commit()
+        if acknowledged:
+            _active_insights_cache.invalidate(user_id)
 
-        return True
+        return acknowledged
 
     async def get_best_item_pairs(
         self,
@@ -909,8 +1271,22 @@ class LearningService:
         limit: int = 10,
     ) -> list[dict]:
         """Get the best performing item pairs for a user."""
+        item1 = aliased(ClothingItem)
+        item2 = aliased(ClothingItem)
+        item_columns = ("id", "type", "name", "primary_color", "thumbnail_path")
+
+        # Select just the serialized item columns through joins instead of
+        # hydrating the pair and both items as ORM objects
         result = await self.db.execute(
-            select(ItemPairScore)
+            select(
+                ItemPairScore.compatibility_score,
+                ItemPairScore.times_paired,
+                ItemPairScore.times_accepted,
+                *(getattr(item1, c).label(f"item1_{c}") for c in item_columns),
+                *(getattr(item2, c).label(f"item2_{c}") for c in item_columns),
+            )
+            .join(item1, ItemPairScore.item1_id == item1.id)
+            .join(item2, ItemPairScore.item2_id == item2.id)
             .where(
                 and_(
                     ItemPairScore.user_id == user_id,
@@ -918,42 +1294,30 @@ class LearningService:
                     ItemPairScore.times_paired >= self.MIN_PAIRS_FOR_SCORING,
                 )
             )
-            .options(
-                selectinload(ItemPairScore.item1),
-                selectinload(ItemPairScore.item2),
-            )
             .order_by(ItemPairScore.compatibility_score.desc())
             .limit(limit)
         )
-        pairs = list(result.scalars().all())
+
+        def item_data(row, side: str) -> dict:
+            thumbnail_path = row[f"{side}_thumbnail_path"]
+            return {
+                "id": str(row[f"{side}_id"]),
+                "type": row[f"{side}_type"],
+                "name": row[f"{side}_name"],
+                "primary_color": row[f"{side}_primary_color"],
+                "thumbnail_path": thumbnail_path,
+                "thumbnail_url": sign_image_url(thumbnail_path) if thumbnail_path else None,
+            }
 
         return [
             {
-                "item1": {
-                    "id": str(p.item1.id),
-                    "type": p.item1.type,
-                    "name": p.item1.name,
-                    "primary_color": p.item1.primary_color,
-                    "thumbnail_path": p.item1.thumbnail_path,
-                    "thumbnail_url": sign_image_url(p.item1.thumbnail_path)
-                    if p.item1.thumbnail_path
-                    else None,
-                },
-                "item2": {
-                    "id": str(p.item2.id),
-                    "type": p.item2.type,
-                    "name": p.item2.name,
-                    "primary_color": p.item2.primary_color,
-                    "thumbnail_path": p.item2.thumbnail_path,
-                    "thumbnail_url": sign_image_url(p.item2.thumbnail_path)
-                    if p.item2.thumbnail_path
-                    else None,
-                },
-                "compatibility_score": float(p.compatibility_score),
-                "times_paired": p.times_paired,
-                "times_accepted": p.times_accepted,
+                "item1": item_data(row, "item1"),
+                "item2": item_data(row, "item2"),
+                "compatibility_score": float(row["compatibility_score"]),
+                "times_paired": row["times_paired"],
+                "times_accepted": row["times_accepted"],
             }
-            for p in pairs
+            for row in result.mappings()
         ]
 
     async def apply_learning_to_preferences(
@@ -985,10 +1349,13 @@ class LearningService:
 
         # Suggest adding learned favorite colors
         if profile.learned_color_scores:
+            favorites = set(prefs.color_favorites or ())
+            avoided = set(prefs.color_avoid or ())
+
             strong_likes = [
                 c
                 for c, s in profile.learned_color_scores.items()
-                if s >= threshold and c not in (prefs.color_favorites or [])
+                if s >= threshold and c not in favorites
             ]
             if strong_likes:
                 updates["suggested_favorite_colors"] = strong_likes
@@ -996,7 +1363,7 @@ class LearningService:
             strong_dislikes = [
                 c
                 for c, s in profile.learned_color_scores.items()
-                if s <= -threshold and c not in (prefs.color_avoid or [])
+                if s <= -threshold and c not in avoided
             ]
             if strong_dislikes:
                 updates["suggested_avoid_colors"] = strong_dislikes
@@ -1,13 +1,72 @@
+import asyncio
 import logging
 import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
+from email import message as email_message
+from email import policy as email_policy
 
 import httpx
 
 from app.schemas.notification import EmailConfig, ExpoPushConfig, MattermostConfig, NtfyConfig
 
+try:
+    import aiosmtplib
+except ImportError:
+    aiosmtplib = None
+
 logger = logging.getLogger(__name__)
 
+# Shared provider clients, bound to the event loop that opens them. The app and
+# worker create them on startup with open_provider_clients and close them on
+# shutdown; sends outside that window (scripts, tests) use one-off connections.
+# The HTTP client pools keep-alive connections instead of opening a new TCP/TLS
+# connection per notification
+_http_client: httpx.AsyncClient | None = None
+
+
+def _new_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=30.0,
+        limits=httpx.Limits(max_keepalive_connections=20),
+    )
+
+
+@asynccontextmanager
+async def _get_http_client() -> AsyncIterator[httpx.AsyncClient]:
+    """Yield the shared HTTP client, or a one-off client when none is open."""
+    if _http_client is not None:
+        yield _http_client
+        return
+    async with _new_http_client() as client:
+        yield client
+
+
+async def open_provider_clients() -> None:
+    """Create the shared provider clients on the running loop; call on app/worker startup."""
+    global _http_client, _smtp_lock
+    _http_client = _new_http_client()
+    _smtp_lock = asyncio.Lock()
+
+
+async def close_provider_clients() -> None:
+    """Close the shared provider HTTP and SMTP clients; call on application/worker shutdown."""
+    global _http_client, _smtp_client, _smtp_lock
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+    if _smtp_lock is not None:
+        async with _smtp_lock:
+            if _smtp_client is not None:
+                if _smtp_client.is_connected:
+                    try:
+                        await _smtp_client.quit()
+                    except aiosmtplib.SMTPException:
+                        _smtp_client.close()
+                _smtp_client = None
+        _smtp_lock = None
+
 
 # ntfy Provider
 @dataclass
@@ -32,6 +91,7 @@ class NtfyProvider:
         headers = {
             "Title": notification.title,
             "Priority": str(notification.priority),
+            "Content-Type": "text/plain; charset=utf-8",
         }
 
         if notification.tags:
@@ -47,26 +107,29 @@ class NtfyProvider:
             headers["Authorization"] = f"Bearer {self.token}"
 
         if notification.actions:
-            actions = []
-            for action in notification.actions:
-                actions.append(f"{action['type']}, {action['label']}, {action['url']}")
-            headers["Actions"] = "; ".join(actions)
+            headers["Actions"] = "; ".join(
+                f"{action['type']}, {action['label']}, {action['url']}"
+                for action in notification.actions
+            )
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with _get_http_client() as client:
                 response = await client.post(
                     f"{self.server}/{notification.topic or self.topic}",
                     headers=headers,
-                    content=notification.message,
+                    content=notification.message.encode("utf-8"),
                 )
 
-                if response.status_code == 200:
-                    return {"success": True, "response": response.json()}
-                else:
-                    return {
-                        "success": False,
-                        "error": f"HTTP {response.status_code}: {response.text}",
-                    }
+            if response.is_success:
+                # ntfy answers with the published message as JSON; don't assume it
+                # for servers or proxies that reply otherwise
+                is_json = response.headers.get("content-type", "").startswith("application/json")
+                return {"success": True, "response": response.json() if is_json else None}
+            else:
+                return {
+                    "success": False,
+                    "error": f"HTTP {response.status_code}: {response.text}",
+                }
         except Exception as e:
             logger.exception("ntfy send failed")
             return {"success": False, "error": str(e)}
@@ -133,16 +196,16 @@ class MattermostProvider:
             ]
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with _get_http_client() as client:
                 response = await client.post(self.webhook_url, json=payload)
 
-                if response.status_code == 200:
-                    return {"success": True}
-                else:
-                    return {
-                        "success": False,
-                        "error": f"HTTP {response.status_code}: {response.text}",
-                    }
+            if response.is_success:
+                return {"success": True}
+            else:
+                return {
+                    "success": False,
+                    "error": f"HTTP {response.status_code}: {response.text}",
+                }
         except Exception as e:
             logger.exception("Mattermost send failed")
             return {"success": False, "error": str(e)}
@@ -158,6 +221,16 @@ class MattermostProvider:
 
 
 # Email Provider
+# While the provider clients are open, one SMTP connection is kept open and
+# reused, so a burst of emails pays for the connect, STARTTLS and login once.
+# The lock serializes sends on it
+_smtp_client: "aiosmtplib.SMTP | None" = None
+_smtp_lock: asyncio.Lock | None = None
+
+# HTML bodies above this size are serialized in a worker thread
+LARGE_EMAIL_BODY_SIZE = 8_192
+
+
 @dataclass
 class EmailMessage:
     to: str
@@ -183,38 +256,70 @@ class EmailProvider:
     async def send(self, message: EmailMessage) -> dict:
         if not self.is_configured():
             return {"success": False, "error": "SMTP not configured"}
+        if aiosmtplib is None:
+            return {"success": False, "error": "aiosmtplib not installed"}
 
         try:
-            from email.mime.multipart import MIMEMultipart
-            from email.mime.text import MIMEText
-
-            import aiosmtplib
-
-            msg = MIMEMultipart("alternative")
-            msg["Subject"] = message.subject
-            msg["From"] = f"{self.from_name} <{self.from_email}>"
-            msg["To"] = message.to
-
-            if message.text_body:
-                msg.attach(MIMEText(message.text_body, "plain"))
-
-            msg.attach(MIMEText(message.html_body, "html"))
-
-            await aiosmtplib.send(
-                msg,
-                hostname=self.smtp_host,
-                port=self.smtp_port,
-                username=self.smtp_user,
-                password=self.smtp_password,
-                start_tls=self.smtp_use_tls,
-            )
+            # Encoding and serializing is CPU-bound; for large bodies keep it off the
+            # event loop, for small ones the thread hop would cost more than it saves
+            if len(message.html_body) > LARGE_EMAIL_BODY_SIZE:
+                data = await asyncio.to_thread(self._build_mime, message)
+            else:
+                data = self._build_mime(message)
+
+            await self._send_message(message.to, data)
             return {"success": True}
-        except ImportError:
-            return {"success": False, "error": "aiosmtplib not installed"}
         except Exception as e:
             logger.exception("Email send failed")
             return {"success": False, "error": str(e)}
 
+    def _build_mime(self, message: EmailMessage) -> bytes:
+        msg = email_message.EmailMessage()
+        msg["Subject"] = message.subject
+        msg["From"] = f"{self.from_name} <{self.from_email}>"
+        msg["To"] = message.to
+
+        if message.text_body:
+            msg.set_content(message.text_body)
+            msg.add_alternative(message.html_body, subtype="html")
+        else:
+            msg.set_content(message.html_body, subtype="html")
+
+        return msg.as_bytes(policy=email_policy.SMTP)
+
+    def _new_smtp_client(self) -> "aiosmtplib.SMTP":
+        return aiosmtplib.SMTP(
+            hostname=self.smtp_host,
+            port=self.smtp_port,
+            username=self.smtp_user,
+            password=self.smtp_password,
+            start_tls=self.smtp_use_tls,
+        )
+
+    async def _send_message(self, recipient: str, data: bytes) -> None:
+        global _smtp_client
+        if _smtp_lock is None:
+            # No shared connection is open; connecting also runs STARTTLS and login
+            async with self._new_smtp_client() as client:
+                await client.sendmail(self.from_email, [recipient], data)
+            return
+
+        async with _smtp_lock:
+            # A reused connection may have been closed by the server while idle;
+            # that only shows up on use, so reconnect and retry once
+            for attempt in range(2):
+                if _smtp_client is None or not _smtp_client.is_connected:
+                    _smtp_client = self._new_smtp_client()
+                    # Connecting also runs STARTTLS and login as configured
+                    await _smtp_client.connect()
+                try:
+                    await _smtp_client.sendmail(self.from_email, [recipient], data)
+                    return
+                except aiosmtplib.SMTPServerDisconnected:
+                    _smtp_client = None
+                    if attempt:
+                        raise
+
     async def test_connection(self) -> bool:
         if not self.is_configured():
             return False
@@ -266,28 +371,28 @@ class ExpoPushProvider:
             payload["badge"] = message.badge
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with _get_http_client() as client:
                 response = await client.post(
                     EXPO_PUSH_URL,
                     json=payload,
                     headers={"Content-Type": "application/json"},
                 )
 
-                if response.status_code == 200:
-                    result = response.json()
-                    ticket = result.get("data", {})
-                    if ticket.get("status") == "ok":
-                        return {"success": True, "ticket_id": ticket.get("id")}
-                    else:
-                        return {
-                            "success": False,
-                            "error": ticket.get("message", "Push send failed"),
-                        }
+            if response.is_success:
+                result = response.json()
+                ticket = result.get("data", {})
+                if ticket.get("status") == "ok":
+                    return {"success": True, "ticket_id": ticket.get("id")}
                 else:
                     return {
                         "success": False,
-                        "error": f"HTTP {response.status_code}: {response.text}",
+                        "error": ticket.get("message", "Push send failed"),
                     }
+            else:
+                return {
+                    "success": False,
+                    "error": f"HTTP {response.status_code}: {response.text}",
+                }
         except Exception as e:
             logger.exception("Expo push send failed")
             return {"success": False, "error": str(e)}
@@ -1,15 +1,20 @@
 import logging
+import time
+from collections.abc import AsyncIterator, Awaitable
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from enum import StrEnum
+from string import Template
+from typing import TypeVar
 from uuid import UUID
 
-from sqlalchemy import and_, select
+from sqlalchemy import and_, delete, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import load_only
 
 from app.models.notification import Notification, NotificationSettings, NotificationStatus
-from app.models.outfit import Outfit, OutfitItem
+from app.models.outfit import Outfit
 from app.models.user import User
 from app.schemas.notification import EmailConfig, ExpoPushConfig, MattermostConfig, NtfyConfig
 from app.services.notification_providers import (
@@ -26,6 +31,134 @@ from app.services.notification_providers import (
 
 logger = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
+# ntfy tag for a weather condition, by the first keyword it contains; earlier
+# entries win, so rain outranks sun for "sun showers"
+_CONDITION_TAGS = (
+    ("rain", "umbrella"),
+    ("drizzle", "umbrella"),
+    ("shower", "umbrella"),
+    ("sun", "sunny"),
+    ("clear", "sunny"),
+    ("cloud", "cloud"),
+    ("overcast", "cloud"),
+    ("snow", "snowflake"),
+    ("sleet", "snowflake"),
+    ("wind", "wind_face"),
+)
+
+# Provider class, config schema and NotificationDispatcher message builder per channel
+_CHANNEL_DISPATCH: dict[str, tuple[type, type, str]] = {
+    "ntfy": (NtfyProvider, NtfyConfig, "_build_ntfy_notification"),
+    "mattermost": (MattermostProvider, MattermostConfig, "_build_mattermost_message"),
+    "email": (EmailProvider, EmailConfig, "_build_email_message"),
+    "expo_push": (ExpoPushProvider, ExpoPushConfig, "_build_expo_push_message"),
+}
+
+# The only user and outfit columns the message builders read; the dispatcher loads
+# just these plus the primary keys instead of hydrating the full rows
+_USER_MESSAGE_COLUMNS = load_only(User.email, User.display_name)
+_OUTFIT_MESSAGE_COLUMNS = load_only(
+    Outfit.occasion,
+    Outfit.weather_data,
+    Outfit.reasoning,
+    Outfit.style_notes,
+    Outfit.ai_raw_response,
+)
+
+# Provider calls slower than this are logged, to spot stalled or blocking channels
+_SLOW_PROVIDER_CALL_SECONDS = 5.0
+
+
+async def _timed(awaitable: Awaitable[_T], label: str) -> _T:
+    start = time.monotonic()
+    try:
+        return await awaitable
+    finally:
+        elapsed = time.monotonic() - start
+        if elapsed > _SLOW_PROVIDER_CALL_SECONDS:
+            logger.warning("Slow notification provider call: %s took %.3fs", label, elapsed)
+
+
+# Outfit email templates, parsed once at import; _build_email_message fills them in
+_EMAIL_WEATHER_TPL = Template(
+    """
+            <p style="color: #6B7280; margin: 0;">
+                ${temperature}C, ${condition}${forecast_note}
+            </p>
+            """
+)
+
+_EMAIL_HIGHLIGHT_ITEM_TPL = Template('<li style="color: #4B5563; margin: 5px 0;">$highlight</li>')
+
+_EMAIL_HIGHLIGHTS_TPL = Template(
+    """
+            <ul style="margin: 15px 0; padding-left: 20px;">
+                $items
+            </ul>
+            """
+)
+
+_EMAIL_STYLING_TIP_TPL = Template(
+    """
+            <div style="background: #F3F4F6; border-radius: 8px; padding: 12px; margin: 15px 0; border: 1px solid #E5E7EB;">
+                <p style="color: #4B5563; margin: 0;">
+                    <strong style="color: #1F2937;">Tip:</strong> $tip
+                </p>
+            </div>
+            """
+)
+
+_EMAIL_HTML_TPL = Template(
+    """
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <meta charset="utf-8">
+            <meta name="viewport" content="width=device-width, initial-scale=1">
+        </head>
+        <body style="font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; max-width: 600px; margin: 0 auto; padding: 20px;">
+            <div style="text-align: center; margin-bottom: 30px;">
+                <h1 style="color: #1F2937; margin: 0;">Wardrowbe</h1>
+            </div>
+
+            <div style="background: #F9FAFB; border-radius: 12px; padding: 20px; margin-bottom: 20px;">
+                <h2 style="color: #1F2937; margin: 0 0 10px 0;">
+                    ${day_label}'s Outfit: $occasion
+                </h2>
+                $weather_html
+            </div>
+
+            <div style="background: #F3F4F6; border-radius: 8px; padding: 15px; margin: 20px 0;">
+                <p style="color: #1F2937; font-weight: 600; margin: 0 0 10px 0;">
+                    $reasoning
+                </p>
+                $highlights_html
+            </div>
+
+            $styling_tip_html
+
+            <div style="text-align: center; margin: 30px 0;">
+                <a href="${app_url}/dashboard/history"
+                   style="background: #3B82F6; color: white; padding: 12px 24px; border-radius: 8px; text-decoration: none; display: inline-block; margin: 5px;">
+                    View Outfit
+                </a>
+            </div>
+
+            <div style="text-align: center; color: #9CA3AF; font-size: 12px; margin-top: 40px;">
+                <p>Sent by Wardrowbe</p>
+                <p>
+                    <a href="${app_url}/dashboard/notifications" style="color: #6B7280;">
+                        Manage notification settings
+                    </a>
+                </p>
+            </div>
+        </body>
+        </html>
+        """
+)
+
 
 class DeliveryStatus(StrEnum):
     PENDING = "pending"
@@ -72,28 +205,24 @@ class NotificationService:
     async def create_setting(
         self, user_id: UUID, channel: str, enabled: bool, priority: int, config: dict
     ) -> NotificationSettings:
-        # Check if channel already exists
-        existing = await self.db.execute(
-            select(NotificationSettings).where(
-                and_(
-                    NotificationSettings.user_id == user_id,
-                    NotificationSettings.channel == channel,
-                )
+        # An already configured channel hits the (user_id, channel) unique constraint;
+        # ON CONFLICT DO NOTHING turns that into no returned row instead of an error
+        # that would abort the transaction, so the insert is also the existence check
+        result = await self.db.execute(
+            insert(NotificationSettings)
+            .values(
+                user_id=user_id,
+                channel=channel,
+                enabled=enabled,
+                priority=priority,
+                config=config,
             )
+            .on_conflict_do_nothing(index_elements=["user_id", "channel"])
+            .returning(NotificationSettings)
         )
-        if existing.scalar_one_or_none():
+        setting = result.scalar_one_or_none()
+        if setting is None:
             raise ValueError(f"Channel {channel} already configured")
-
-        setting = NotificationSettings(
-            user_id=user_id,
-            channel=channel,
-            enabled=enabled,
-            priority=priority,
-            config=config,
-        )
-        self.db.add(setting)
-        await self.db.flush()
-        await self.db.refresh(setting)
         return setting
 
     async def update_setting(
@@ -104,29 +233,41 @@ class NotificationService:
         priority: int | None = None,
         config: dict | None = None,
     ) -> NotificationSettings | None:
-        setting = await self.get_setting_by_id(setting_id, user_id)
-        if not setting:
-            return None
-
-        if enabled is not None:
-            setting.enabled = enabled
-        if priority is not None:
-            setting.priority = priority
-        if config is not None:
-            setting.config = config
-
-        await self.db.flush()
-        await self.db.refresh(setting)
-        return setting
+        values = {
+            key: value
+            for key, value in (("enabled", enabled), ("priority", priority), ("config", config))
+            if value is not None
+        }
+        if not values:
+            return await self.get_setting_by_id(setting_id, user_id)
+
+        # UPDATE ... RETURNING checks ownership, writes the changes and reloads the
+        # setting (including the server-side updated_at) in one round trip
+        result = await self.db.execute(
+            update(NotificationSettings)
+            .where(
+                and_(
+                    NotificationSettings.id == setting_id,
+                    NotificationSettings.user_id == user_id,
+                )
+            )
+            .values(**values)
+            .returning(NotificationSettings)
+        )
+        return result.scalar_one_or_none()
 
     async def delete_setting(self, setting_id: UUID, user_id: UUID) -> bool:
-        setting = await self.get_setting_by_id(setting_id, user_id)
-        if not setting:
-            return False
-
-        await self.db.delete(setting)
-        await self.db.flush()
-        return True
+        result = await self.db.execute(
+            delete(NotificationSettings)
+            .where(
+                and_(
+                    NotificationSettings.id == setting_id,
+                    NotificationSettings.user_id == user_id,
+                )
+            )
+            .returning(NotificationSettings.id)
+        )
+        return result.first() is not None
 
     async def test_setting(self, setting_id: UUID, user_id: UUID) -> tuple[bool, str]:
         setting = await self.get_setting_by_id(setting_id, user_id)
@@ -134,21 +275,14 @@ class NotificationService:
             return False, "Setting not found"
 
         try:
-            if setting.channel == "ntfy":
-                provider = NtfyProvider(NtfyConfig(**setting.config))
-                success = await provider.test_connection()
-            elif setting.channel == "mattermost":
-                provider = MattermostProvider(MattermostConfig(**setting.config))
-                success = await provider.test_connection()
-            elif setting.channel == "email":
-                provider = EmailProvider(EmailConfig(**setting.config))
-                success = await provider.test_connection()
-            elif setting.channel == "expo_push":
-                provider = ExpoPushProvider(ExpoPushConfig(**setting.config))
-                success = await provider.test_connection()
-            else:
+            entry = _CHANNEL_DISPATCH.get(setting.channel)
+            if entry is None:
                 return False, f"Unknown channel: {setting.channel}"
 
+            provider_cls, config_cls, _ = entry
+            provider = provider_cls(config_cls(**setting.config))
+            success = await _timed(provider.test_connection(), f"{setting.channel} test")
+
             if success:
                 return True, "Test notification sent successfully"
             else:
@@ -161,39 +295,42 @@ class NotificationDispatcher:
     def __init__(self, db: AsyncSession, app_url: str):
         self.db = db
         self.app_url = app_url.rstrip("/")
+        # Set when a failed delivery is recorded for retry, so the caller can wake the
+        # retry job instead of leaving it to the next cron run
+        self.retry_pending = False
 
     async def send_outfit_notification(
         self, user_id: UUID, outfit_id: UUID, for_tomorrow: bool = False
     ) -> list[NotificationResult]:
-        # Get user
-        user_result = await self.db.execute(select(User).where(User.id == user_id))
-        user = user_result.scalar_one_or_none()
-        if not user:
+        # Get user with their enabled channels sorted by priority in one query; a
+        # user without enabled channels comes back as a single row with no settings
+        user_result = await self.db.execute(
+            select(User, NotificationSettings)
+            .outerjoin(
+                NotificationSettings,
+                and_(
+                    NotificationSettings.user_id == User.id,
+                    NotificationSettings.enabled,
+                ),
+            )
+            .options(_USER_MESSAGE_COLUMNS)
+            .where(User.id == user_id)
+            .order_by(NotificationSettings.priority)
+        )
+        rows = user_result.all()
+        if not rows:
             raise ValueError("User not found")
+        user = rows[0][0]
+        channels = [channel for _, channel in rows if channel is not None]
 
-        # Get outfit with items loaded
+        # Get outfit; the message builders only read a few of its own columns
         outfit_result = await self.db.execute(
-            select(Outfit)
-            .where(Outfit.id == outfit_id)
-            .options(selectinload(Outfit.items).selectinload(OutfitItem.item))
+            select(Outfit).options(_OUTFIT_MESSAGE_COLUMNS).where(Outfit.id == outfit_id)
         )
         outfit = outfit_result.scalar_one_or_none()
         if not outfit:
             raise ValueError("Outfit not found")
 
-        # Get enabled channels sorted by priority
-        channels_result = await self.db.execute(
-            select(NotificationSettings)
-            .where(
-                and_(
-                    NotificationSettings.user_id == user_id,
-                    NotificationSettings.enabled,
-                )
-            )
-            .order_by(NotificationSettings.priority)
-        )
-        channels = list(channels_result.scalars().all())
-
         if not channels:
             return [
                 NotificationResult(
@@ -215,6 +352,8 @@ class NotificationDispatcher:
 
             if result.status == DeliveryStatus.SENT:
                 success = True
+                # One timestamp so the notification and outfit agree on the send time
+                sent_at = datetime.now(UTC)
 
                 # Record notification
                 notification = Notification(
@@ -223,12 +362,12 @@ class NotificationDispatcher:
                     channel=channel_config.channel,
                     status=NotificationStatus.sent,
                     payload={"occasion": outfit.occasion},
-                    sent_at=datetime.now(UTC),
+                    sent_at=sent_at,
                 )
                 self.db.add(notification)
 
                 # Update outfit status
-                outfit.sent_at = datetime.now(UTC)
+                outfit.sent_at = sent_at
                 outfit.status = "sent"
 
                 await self.db.flush()
@@ -247,54 +386,105 @@ class NotificationDispatcher:
             )
             self.db.add(notification)
             await self.db.flush()
+            self.retry_pending = True
 
         return results
 
-    async def retry_notification(self, notification: Notification) -> NotificationResult:
-        # Get user
-        user_result = await self.db.execute(select(User).where(User.id == notification.user_id))
-        user = user_result.scalar_one_or_none()
-        if not user:
-            return NotificationResult(
-                channel=notification.channel,
-                status=DeliveryStatus.FAILED,
-                error="User not found",
-            )
+    async def retry_notification(self, notification: Notification) -> NotificationResult | None:
+        """Retry one notification; None when another retry run has already claimed it."""
+        async for _, result in self.retry_notifications([notification]):
+            return result
+        return None
 
-        # Get outfit with items loaded
-        outfit_result = await self.db.execute(
-            select(Outfit)
-            .where(Outfit.id == notification.outfit_id)
-            .options(selectinload(Outfit.items).selectinload(OutfitItem.item))
+    async def retry_notifications(
+        self, notifications: list[Notification]
+    ) -> AsyncIterator[tuple[Notification, NotificationResult]]:
+        """Retry a batch of notifications, yielding each with its result in order.
+
+        Users, outfits and channel settings are fetched with one query per table for
+        the whole batch. Deliveries then run one at a time, so the caller can commit
+        each outcome before the next notification is sent.
+
+        Each notification's row is locked for its delivery, until the caller's next
+        commit. Notifications that another retry run holds, or has attempted since
+        they were read, are skipped rather than sent twice.
+        """
+        if not notifications:
+            return
+
+        # The message builders only read a few of the outfit's own columns
+        user_ids = {n.user_id for n in notifications}
+        outfit_ids = {n.outfit_id for n in notifications}
+        channel_keys = {(n.user_id, n.channel) for n in notifications}
+
+        users_result = await self.db.execute(
+            select(User).options(_USER_MESSAGE_COLUMNS).where(User.id.in_(user_ids))
         )
-        outfit = outfit_result.scalar_one_or_none()
-        if not outfit:
-            return NotificationResult(
-                channel=notification.channel,
-                status=DeliveryStatus.FAILED,
-                error="Outfit not found",
-            )
+        users = {user.id: user for user in users_result.scalars()}
+
+        outfits_result = await self.db.execute(
+            select(Outfit).options(_OUTFIT_MESSAGE_COLUMNS).where(Outfit.id.in_(outfit_ids))
+        )
+        outfits = {outfit.id: outfit for outfit in outfits_result.scalars()}
 
-        # Get the channel config for this notification's channel
-        channel_result = await self.db.execute(
+        channels_result = await self.db.execute(
             select(NotificationSettings).where(
                 and_(
-                    NotificationSettings.user_id == notification.user_id,
-                    NotificationSettings.channel == notification.channel,
+                    tuple_(NotificationSettings.user_id, NotificationSettings.channel).in_(
+                        channel_keys
+                    ),
                     NotificationSettings.enabled,
                 )
             )
         )
-        channel_config = channel_result.scalar_one_or_none()
-        if not channel_config:
-            return NotificationResult(
-                channel=notification.channel,
-                status=DeliveryStatus.FAILED,
-                error=f"Channel {notification.channel} not configured or disabled",
+        channels = {
+            (setting.user_id, setting.channel): setting for setting in channels_result.scalars()
+        }
+
+        async def retry(notification: Notification) -> NotificationResult:
+            user = users.get(notification.user_id)
+            if not user:
+                return NotificationResult(
+                    channel=notification.channel,
+                    status=DeliveryStatus.FAILED,
+                    error="User not found",
+                )
+
+            outfit = outfits.get(notification.outfit_id)
+            if not outfit:
+                return NotificationResult(
+                    channel=notification.channel,
+                    status=DeliveryStatus.FAILED,
+                    error="Outfit not found",
+                )
+
+            channel_config = channels.get((notification.user_id, notification.channel))
+            if not channel_config:
+                return NotificationResult(
+                    channel=notification.channel,
+                    status=DeliveryStatus.FAILED,
+                    error=f"Channel {notification.channel} not configured or disabled",
+                )
+
+            return await self._send_via_channel(channel_config, outfit, user)
+
+        for notification in notifications:
+            claimed = await self.db.execute(
+                select(Notification.id)
+                .where(
+                    and_(
+                        Notification.id == notification.id,
+                        Notification.status == NotificationStatus.retrying,
+                        Notification.attempts == notification.attempts,
+                    )
+                )
+                .with_for_update(skip_locked=True)
             )
+            if claimed.scalar_one_or_none() is None:
+                logger.debug(f"Notification {notification.id} is being retried elsewhere")
+                continue
 
-        # Attempt to send
-        return await self._send_via_channel(channel_config, outfit, user)
+            yield notification, await retry(notification)
 
     async def _send_via_channel(
         self,
@@ -304,33 +494,19 @@ class NotificationDispatcher:
         for_tomorrow: bool = False,
     ) -> NotificationResult:
         try:
-            if channel_config.channel == "ntfy":
-                provider = NtfyProvider(NtfyConfig(**channel_config.config))
-                message = self._build_ntfy_notification(outfit, user, for_tomorrow)
-                result = await provider.send(message)
-
-            elif channel_config.channel == "mattermost":
-                provider = MattermostProvider(MattermostConfig(**channel_config.config))
-                message = self._build_mattermost_message(outfit, user, for_tomorrow)
-                result = await provider.send(message)
-
-            elif channel_config.channel == "email":
-                provider = EmailProvider(EmailConfig(**channel_config.config))
-                message = self._build_email_message(outfit, user, for_tomorrow)
-                result = await provider.send(message)
-
-            elif channel_config.channel == "expo_push":
-                provider = ExpoPushProvider(ExpoPushConfig(**channel_config.config))
-                message = self._build_expo_push_message(outfit, user, for_tomorrow)
-                result = await provider.send(message)
-
-            else:
+            entry = _CHANNEL_DISPATCH.get(channel_config.channel)
+            if entry is None:
                 return NotificationResult(
                     channel=channel_config.channel,
                     status=DeliveryStatus.FAILED,
                     error=f"Unknown channel: {channel_config.channel}",
                 )
 
+            provider_cls, config_cls, builder_name = entry
+            provider = provider_cls(config_cls(**channel_config.config))
+            message = getattr(self, builder_name)(outfit, user, for_tomorrow)
+            result = await _timed(provider.send(message), f"{channel_config.channel} send")
+
             if result.get("success"):
                 return NotificationResult(
                     channel=channel_config.channel,
@@ -383,8 +559,7 @@ class NotificationDispatcher:
 
         if highlights and isinstance(highlights, list):
             # Format highlights as bullet points
-            highlight_lines = [f"* {h}" for h in highlights[:3]]  # Limit to 3
-            parts.append("\n".join(highlight_lines))
+            parts.append("\n".join(f"* {h}" for h in highlights[:3]))  # Limit to 3
 
         # Add styling tip if available
         if outfit.style_notes:
@@ -393,18 +568,7 @@ class NotificationDispatcher:
         message = "\n\n".join(parts) if parts else "Your outfit is ready."
 
         # Choose a single contextual tag based on weather
-        tag = "shirt"  # default
-        if condition:
-            if any(w in condition for w in ["rain", "drizzle", "shower"]):
-                tag = "umbrella"
-            elif any(w in condition for w in ["sun", "clear"]):
-                tag = "sunny"
-            elif any(w in condition for w in ["cloud", "overcast"]):
-                tag = "cloud"
-            elif any(w in condition for w in ["snow", "sleet"]):
-                tag = "snowflake"
-            elif any(w in condition for w in ["wind"]):
-                tag = "wind_face"
+        tag = next((t for keyword, t in _CONDITION_TAGS if keyword in condition), "shirt")
 
         return NtfyNotification(
             topic="",  # Will be set by provider
@@ -439,8 +603,7 @@ class NotificationDispatcher:
             highlights = outfit.ai_raw_response.get("highlights", [])
 
         if highlights and isinstance(highlights, list):
-            highlight_lines = [f"- {h}" for h in highlights[:3]]
-            text_parts.append("\n".join(highlight_lines))
+            text_parts.append("\n".join(f"- {h}" for h in highlights[:3]))
 
         # Add styling tip
         if outfit.style_notes:
@@ -465,14 +628,15 @@ class NotificationDispatcher:
         weather_html = ""
         if outfit.weather_data:
             weather = outfit.weather_data
-            forecast_note = " (forecast)" if for_tomorrow else ""
-            weather_html = f"""
-            <p style="color: #6B7280; margin: 0;">
-                {weather.get("temperature", "?")}C, {weather.get("condition", "Unknown")}{forecast_note}
-            </p>
-            """
+            weather_html = _EMAIL_WEATHER_TPL.substitute(
+                temperature=weather.get("temperature", "?"),
+                condition=weather.get("condition", "Unknown"),
+                forecast_note=" (forecast)" if for_tomorrow else "",
+            )
 
         day_label = "Tomorrow" if for_tomorrow else "Today"
+        occasion = outfit.occasion.title()
+        reasoning = outfit.reasoning or "Your outfit is ready!"
 
         # Build highlights HTML
         highlights_html = ""
@@ -481,99 +645,45 @@ class NotificationDispatcher:
             highlights = outfit.ai_raw_response.get("highlights", [])
 
         if highlights and isinstance(highlights, list):
-            items_html = "".join(
-                f'<li style="color: #4B5563; margin: 5px 0;">{h}</li>' for h in highlights[:3]
+            highlights_html = _EMAIL_HIGHLIGHTS_TPL.substitute(
+                items="".join(
+                    _EMAIL_HIGHLIGHT_ITEM_TPL.substitute(highlight=h) for h in highlights[:3]
+                )
             )
-            highlights_html = f"""
-            <ul style="margin: 15px 0; padding-left: 20px;">
-                {items_html}
-            </ul>
-            """
 
         # Build styling tip HTML
         styling_tip_html = ""
         if outfit.style_notes:
-            styling_tip_html = f"""
-            <div style="background: #F3F4F6; border-radius: 8px; padding: 12px; margin: 15px 0; border: 1px solid #E5E7EB;">
-                <p style="color: #4B5563; margin: 0;">
-                    <strong style="color: #1F2937;">Tip:</strong> {outfit.style_notes}
-                </p>
-            </div>
-            """
-
-        html_body = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1">
-        </head>
-        <body style="font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; max-width: 600px; margin: 0 auto; padding: 20px;">
-            <div style="text-align: center; margin-bottom: 30px;">
-                <h1 style="color: #1F2937; margin: 0;">Wardrowbe</h1>
-            </div>
-
-            <div style="background: #F9FAFB; border-radius: 12px; padding: 20px; margin-bottom: 20px;">
-                <h2 style="color: #1F2937; margin: 0 0 10px 0;">
-                    {day_label}'s Outfit: {outfit.occasion.title()}
-                </h2>
-                {weather_html}
-            </div>
-
-            <div style="background: #F3F4F6; border-radius: 8px; padding: 15px; margin: 20px 0;">
-                <p style="color: #1F2937; font-weight: 600; margin: 0 0 10px 0;">
-                    {outfit.reasoning or "Your outfit is ready!"}
-                </p>
-                {highlights_html}
-            </div>
-
-            {styling_tip_html}
-
-            <div style="text-align: center; margin: 30px 0;">
-                <a href="{self.app_url}/dashboard/history"
-                   style="background: #3B82F6; color: white; padding: 12px 24px; border-radius: 8px; text-decoration: none; display: inline-block; margin: 5px;">
-                    View Outfit
-                </a>
-            </div>
-
-            <div style="text-align: center; color: #9CA3AF; font-size: 12px; margin-top: 40px;">
-                <p>Sent by Wardrowbe</p>
-                <p>
-                    <a href="{self.app_url}/dashboard/notifications" style="color: #6B7280;">
-                        Manage notification settings
-                    </a>
-                </p>
-            </div>
-        </body>
-        </html>
-        """
+            styling_tip_html = _EMAIL_STYLING_TIP_TPL.substitute(tip=outfit.style_notes)
+
+        html_body = _EMAIL_HTML_TPL.substitute(
+            day_label=day_label,
+            occasion=occasion,
+            weather_html=weather_html,
+            reasoning=reasoning,
+            highlights_html=highlights_html,
+            styling_tip_html=styling_tip_html,
+            app_url=self.app_url,
+        )
 
         # Build text body with highlights
-        text_parts = [
-            f"Wardrowbe - {day_label}'s Outfit",
-            "",
-            f"Occasion: {outfit.occasion.title()}",
-            "",
-            outfit.reasoning or "Your outfit is ready!",
-        ]
-
-        if highlights:
-            text_parts.append("")
-            for h in highlights[:3]:
-                text_parts.append(f"- {h}")
-
-        if outfit.style_notes:
-            text_parts.append("")
-            text_parts.append(f"Tip: {outfit.style_notes}")
-
-        text_parts.append("")
-        text_parts.append(f"View outfit: {self.app_url}/dashboard/history")
-
-        text_body = "\n".join(text_parts)
+        text_body = "\n".join(
+            [
+                f"Wardrowbe - {day_label}'s Outfit",
+                "",
+                f"Occasion: {occasion}",
+                "",
+                reasoning,
+                *(["", *(f"- {h}" for h in highlights[:3])] if highlights else []),
+                *(["", f"Tip: {outfit.style_notes}"] if outfit.style_notes else []),
+                "",
+                f"View outfit: {self.app_url}/dashboard/history",
+            ]
+        )
 
         return EmailMessage(
             to=user.email,
-            subject=f"{day_label}'s Outfit: {outfit.occasion.title()}",
+            subject=f"{day_label}'s Outfit: {occasion}",
             html_body=html_body,
             text_body=text_body,
         )
@@ -35,6 +35,26 @@ async def get_db_session() -> AsyncSession:
     return async_session()
 
 
+# Delay before a failed delivery is retried by a scheduled wake-up; the five-minute
+# retry cron stays as a backstop
+RETRY_DELAY = timedelta(minutes=1)
+
+
+async def schedule_retry(ctx: dict) -> None:
+    """Run retry_failed_notifications after RETRY_DELAY instead of at its next cron tick."""
+    redis = ctx.get("redis")
+    if redis is None:
+        return
+    # One job id per minute coalesces the wake-ups from a burst of failures into one
+    # run; arq skips enqueueing a job id it already holds
+    window = int(datetime.now(UTC).timestamp() // 60)
+    await redis.enqueue_job(
+        "retry_failed_notifications",
+        _job_id=f"retry_failed_notifications:{window}",
+        _defer_by=RETRY_DELAY,
+    )
+
+
 async def send_notification(ctx: dict, user_id: str, outfit_id: str):
     logger.info(f"Sending notification for outfit {outfit_id} to user {user_id}")
 
@@ -46,6 +66,8 @@ async def send_notification(ctx: dict, user_id: str, outfit_id: str):
         results = await dispatcher.send_outfit_notification(user_id=user_id, outfit_id=outfit_id)
 
         await db.commit()
+        if dispatcher.retry_pending:
+            await schedule_retry(ctx)
 
         # Log results
         for result in results:
@@ -88,18 +110,20 @@ async def retry_failed_notifications(ctx: dict):
         app_url = os.getenv("APP_URL", "http://localhost:3000")
         dispatcher = NotificationDispatcher(db, app_url)
 
-        for notification in notifications:
+        # Retry via the existing notifications (don't create new records); the
+        # dispatcher loads users, outfits and channels for the whole batch at once
+        # and sends one at a time, so each outcome is committed before the next send
+        async for notification, result in dispatcher.retry_notifications(notifications):
             try:
-                # Increment attempt counter
+                # Increment attempt counter; one clock read stamps both the attempt
+                # and, on success, the send
+                now = datetime.now(UTC)
                 notification.attempts += 1
-                notification.last_attempt_at = datetime.now(UTC)
-
-                # Retry via the existing notification (don't create new records)
-                result = await dispatcher.retry_notification(notification)
+                notification.last_attempt_at = now
 
                 if result.status == DeliveryStatus.SENT:
                     notification.status = NotificationStatus.sent
-                    notification.sent_at = datetime.now(UTC)
+                    notification.sent_at = now
                     retried += 1
                 elif notification.attempts >= notification.max_attempts:
                     notification.status = NotificationStatus.failed
@@ -262,6 +286,9 @@ async def check_scheduled_notifications(ctx: dict):
                     f"Failed to generate/send notification for user {schedule.user_id}: {e}"
                 )
 
+        if dispatcher.retry_pending:
+            await schedule_retry(ctx)
+
         logger.info(f"Checked {len(schedules)} schedules, {triggered} triggered")
         return {"checked": len(schedules), "triggered": triggered}
 
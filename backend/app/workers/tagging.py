@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_asyn
 from app.config import get_settings
 from app.models.item import ClothingItem, ItemStatus
 from app.services.ai_service import AIService, ClothingTags
+from app.services.notification_providers import close_provider_clients, open_provider_clients
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -225,6 +226,7 @@ async def tag_item_image(ctx: dict, item_id: str, image_path: str) -> dict[str,
 async def startup(ctx: dict) -> None:
     """Worker startup hook."""
     logger.info("Tagging worker starting up...")
+    await open_provider_clients()
     ctx["ai_service"] = AIService()
     health = await ctx["ai_service"].check_health()
     logger.info(f"AI service health: {health}")
@@ -233,6 +235,7 @@ async def startup(ctx: dict) -> None:
 async def shutdown(ctx: dict) -> None:
     """Worker shutdown hook."""
     logger.info("Tagging worker shutting down...")
+    await close_provider_clients()
 
 
 class WorkerSettings:
@@ -0,0 +1,103 @@
+"""add trigger-maintained item type and color counts
+
+Revision ID: e5a7c2f9b134
+Revises: d91b6e3c0a28
+Create Date: 2026-10-16
+
+The wardrobe stats endpoints grouped (and unnested) every non-archived item on
+each request. These tables hold the per-user counts instead, kept current by a
+row trigger on clothing_items, so the endpoints become indexed lookups.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import UUID
+
+# revision identifiers, used by Alembic.
+revision: str = "e5a7c2f9b134"
+down_revision: str | None = "d91b6e3c0a28"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "item_type_counts",
+        sa.Column(
+            "user_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("type", sa.String(50), primary_key=True),
+        sa.Column("count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.create_table(
+        "item_color_counts",
+        sa.Column(
+            "user_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("color", sa.String(), primary_key=True),
+        sa.Column("count", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION update_item_counts() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') AND NOT OLD.is_archived THEN
+                UPDATE item_type_counts SET count = count - 1
+                WHERE user_id = OLD.user_id AND type = OLD.type;
+                UPDATE item_color_counts AS c SET count = c.count - old_colors.n
+                FROM (
+                    SELECT color, count(*) AS n FROM unnest(OLD.colors) AS color
+                    WHERE color IS NOT NULL GROUP BY color
+                ) AS old_colors
+                WHERE c.user_id = OLD.user_id AND c.color = old_colors.color;
+                DELETE FROM item_type_counts WHERE user_id = OLD.user_id AND count <= 0;
+                DELETE FROM item_color_counts WHERE user_id = OLD.user_id AND count <= 0;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') AND NOT NEW.is_archived THEN
+                INSERT INTO item_type_counts (user_id, type, count)
+                VALUES (NEW.user_id, NEW.type, 1)
+                ON CONFLICT (user_id, type) DO UPDATE SET count = item_type_counts.count + 1;
+                INSERT INTO item_color_counts (user_id, color, count)
+                SELECT NEW.user_id, color, count(*) FROM unnest(NEW.colors) AS color
+                WHERE color IS NOT NULL GROUP BY color
+                ON CONFLICT (user_id, color)
+                DO UPDATE SET count = item_color_counts.count + EXCLUDED.count;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER clothing_items_update_counts
+        AFTER INSERT OR DELETE OR UPDATE OF user_id, type, colors, is_archived ON clothing_items
+        FOR EACH ROW EXECUTE FUNCTION update_item_counts()
+    """)
+
+    # Backfill from existing items
+    op.execute("""
+        INSERT INTO item_type_counts (user_id, type, count)
+        SELECT user_id, type, count(*) FROM clothing_items
+        WHERE NOT is_archived
+        GROUP BY user_id, type
+    """)
+    op.execute("""
+        INSERT INTO item_color_counts (user_id, color, count)
+        SELECT user_id, color, count(*) FROM clothing_items, unnest(colors) AS color
+        WHERE NOT is_archived AND color IS NOT NULL
+        GROUP BY user_id, color
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS clothing_items_update_counts ON clothing_items")
+    op.execute("DROP FUNCTION IF EXISTS update_item_counts()")
+    op.drop_table("item_color_counts")
+    op.drop_table("item_type_counts")
@@ -0,0 +1,47 @@
+"""add lower() expression indexes for case-insensitive item matches
+
+Revision ID: a8d3f6b2c710
+Revises: f2c8d5a1e693
+Create Date: 2026-10-16
+
+The type filter and the exact-brand branch of item search compare
+``lower(column)`` against a lower-cased value. Expression indexes on the same
+``lower()`` calls, led by user_id, let those equality checks use a B-tree
+instead of the full-text index.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a8d3f6b2c710"
+down_revision: str | None = "f2c8d5a1e693"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+LOWER_COLUMNS = ("brand", "type")
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for column in LOWER_COLUMNS:
+            op.create_index(
+                f"idx_clothing_items_user_lower_{column}",
+                "clothing_items",
+                ["user_id", sa.text(f"lower({column})")],
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for column in LOWER_COLUMNS:
+            op.drop_index(
+                f"idx_clothing_items_user_lower_{column}",
+                "clothing_items",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,85 @@
+"""move item pair occasion/weather counts into child tables
+
+Revision ID: f4d9b2e6c813
+Revises: e8b4c1f7a302
+Create Date: 2026-10-16
+
+item_pair_scores kept per-occasion and per-temperature-bucket counts in two
+JSONB columns that were read, copied and rewritten whole on every feedback.
+Each counter now lives in its own row of item_pair_occasion_stats or
+item_pair_weather_stats and is bumped with an upsert. Existing counts are
+copied across before the JSONB columns are dropped; downgrading rebuilds them.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+# revision identifiers, used by Alembic.
+revision: str = "f4d9b2e6c813"
+down_revision: str | None = "e8b4c1f7a302"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# (table, context column, its length, the item_pair_scores JSONB column it replaces)
+CONTEXT_TABLES = (
+    ("item_pair_occasion_stats", "occasion", 50, "occasion_performance"),
+    ("item_pair_weather_stats", "temp_bucket", 10, "weather_performance"),
+)
+
+
+def upgrade() -> None:
+    for table, context, length, json_column in CONTEXT_TABLES:
+        op.create_table(
+            table,
+            sa.Column("user_id", UUID(as_uuid=True), primary_key=True),
+            sa.Column("item1_id", UUID(as_uuid=True), primary_key=True),
+            sa.Column("item2_id", UUID(as_uuid=True), primary_key=True),
+            sa.Column(context, sa.String(length), primary_key=True),
+            sa.Column("count", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("positive", sa.Integer(), nullable=False, server_default="0"),
+            sa.ForeignKeyConstraint(
+                ["user_id", "item1_id", "item2_id"],
+                [
+                    "item_pair_scores.user_id",
+                    "item_pair_scores.item1_id",
+                    "item_pair_scores.item2_id",
+                ],
+                ondelete="CASCADE",
+            ),
+        )
+        op.execute(f"""
+            INSERT INTO {table} (user_id, item1_id, item2_id, {context}, count, positive)
+            SELECT p.user_id, p.item1_id, p.item2_id, e.key,
+                   coalesce((e.value ->> 'count')::int, 0),
+                   coalesce((e.value ->> 'positive')::int, 0)
+            FROM item_pair_scores AS p,
+                 jsonb_each(
+                     CASE WHEN jsonb_typeof(p.{json_column}) = 'object'
+                     THEN p.{json_column} ELSE '{{}}'::jsonb END
+                 ) AS e
+        """)
+        op.drop_column("item_pair_scores", json_column)
+
+
+def downgrade() -> None:
+    for table, context, _length, json_column in CONTEXT_TABLES:
+        op.add_column(
+            "item_pair_scores",
+            sa.Column(json_column, JSONB, nullable=False, server_default="{}"),
+        )
+        op.execute(f"""
+            UPDATE item_pair_scores AS p SET {json_column} = s.counts
+            FROM (
+                SELECT user_id, item1_id, item2_id,
+                       jsonb_object_agg(
+                           {context}, jsonb_build_object('count', count, 'positive', positive)
+                       ) AS counts
+                FROM {table}
+                GROUP BY user_id, item1_id, item2_id
+            ) AS s
+            WHERE p.user_id = s.user_id AND p.item1_id = s.item1_id AND p.item2_id = s.item2_id
+        """)
+        op.drop_table(table)
@@ -0,0 +1,46 @@
+"""add per-side lookup indexes for item pair scores
+
+Revision ID: e8b4c1f7a302
+Revises: d2a7e4b9f615
+Create Date: 2026-10-16
+
+Pair suggestions look an item up on each side of a pair separately and take
+the best-scoring rows. These indexes serve each side as a single range scan
+in score order, so the LIMIT stops the scan early.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e8b4c1f7a302"
+down_revision: str | None = "d2a7e4b9f615"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+PAIR_SIDES = ("item1_id", "item2_id")
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for column in PAIR_SIDES:
+            op.create_index(
+                f"ix_item_pair_scores_user_{column}_score",
+                "item_pair_scores",
+                ["user_id", column, sa.text("compatibility_score DESC")],
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for column in PAIR_SIDES:
+            op.drop_index(
+                f"ix_item_pair_scores_user_{column}_score",
+                "item_pair_scores",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,53 @@
+"""add full-text search index to clothing_items
+
+Revision ID: c4f81a2e6d57
+Revises: 45702c628c1f
+Create Date: 2026-10-16
+
+Item search previously OR'd four ILIKE predicates with leading wildcards, which
+no B-tree index can serve. A GIN index over the to_tsvector expression of name,
+brand, type and notes lets a single index probe answer it. The query in
+ItemService renders the same expression, so no stored column is needed and the
+table is not rewritten. The index is built concurrently so existing wardrobes
+stay writable during the upgrade, which requires running outside the migration
+transaction.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c4f81a2e6d57"
+down_revision: str | None = "45702c628c1f"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Must match ItemService's _search_document exactly for Postgres to use the index
+SEARCH_DOCUMENT = (
+    "to_tsvector('english', coalesce(name, '') || ' ' || coalesce(brand, '') || ' ' || "
+    "coalesce(type, '') || ' ' || coalesce(notes, ''))"
+)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_clothing_items_search_document",
+            "clothing_items",
+            [sa.text(SEARCH_DOCUMENT)],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "idx_clothing_items_search_document",
+            "clothing_items",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
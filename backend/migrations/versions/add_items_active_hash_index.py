@@ -0,0 +1,43 @@
+"""add partial index for duplicate-image lookups
+
+Revision ID: f2c8d5a1e693
+Revises: e5a7c2f9b134
+Create Date: 2026-10-16
+
+Duplicate detection on upload only considers a user's active items that have a
+pHash. A partial index over exactly those rows keeps the lookup to one small
+B-tree instead of filtering the user's whole wardrobe.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f2c8d5a1e693"
+down_revision: str | None = "e5a7c2f9b134"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_clothing_items_user_hash_active",
+            "clothing_items",
+            ["user_id", "image_hash"],
+            postgresql_where=sa.text("is_archived = false AND image_hash IS NOT NULL"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "idx_clothing_items_user_hash_active",
+            "clothing_items",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,44 @@
+"""add composite index for the item list query
+
+Revision ID: d91b6e3c0a28
+Revises: c4f81a2e6d57
+Create Date: 2026-10-16
+
+The wardrobe list filters on user_id and is_archived and pages by created_at
+with id as the tie-breaker, in either direction. Keying the index on exactly
+that order lets Postgres read a page straight off the index, scanning forwards
+for newest first and backwards for oldest first, instead of sorting every
+matching row.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d91b6e3c0a28"
+down_revision: str | None = "c4f81a2e6d57"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_clothing_items_user_archived_created",
+            "clothing_items",
+            ["user_id", "is_archived", sa.text("created_at DESC"), sa.text("id DESC")],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "idx_clothing_items_user_archived_created",
+            "clothing_items",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,33 @@
+"""add learning_totals to user_learning_profiles
+
+Revision ID: d2a7e4b9f615
+Revises: c6f1d8e2a947
+Create Date: 2026-10-16
+
+Keeps the running sums and counts behind each learned score, so new feedback
+can be folded into a profile without re-scanning the user's outfit history.
+Existing profiles start empty and are filled by their next full recompute.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import JSONB
+
+# revision identifiers, used by Alembic.
+revision: str = "d2a7e4b9f615"
+down_revision: str | None = "c6f1d8e2a947"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "user_learning_profiles",
+        sa.Column("learning_totals", JSONB, nullable=False, server_default="{}"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("user_learning_profiles", "learning_totals")
@@ -0,0 +1,33 @@
+"""add feedback_hash to outfit_performances
+
+Revision ID: a1c7e5f3b928
+Revises: f4d9b2e6c813
+Create Date: 2026-10-16
+
+Stores a fingerprint of the feedback each performance row was computed from,
+so processing the same feedback again (client retries, repeated submits) can
+return before touching pair scores or recomputing the learning profile.
+Existing rows start without a hash and are refreshed on their next feedback.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a1c7e5f3b928"
+down_revision: str | None = "f4d9b2e6c813"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "outfit_performances",
+        sa.Column("feedback_hash", sa.String(length=32), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("outfit_performances", "feedback_hash")
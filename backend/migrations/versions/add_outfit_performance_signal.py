@@ -0,0 +1,32 @@
+"""add signal to outfit_performances
+
+Revision ID: c6f1d8e2a947
+Revises: b3e9a7d40c52
+Create Date: 2026-10-16
+
+Stores the signed feedback signal (-1 to 1) computed when feedback is
+processed, so recomputing a learning profile reads it instead of deriving it
+again from the outfit status and feedback fields.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c6f1d8e2a947"
+down_revision: str | None = "b3e9a7d40c52"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "outfit_performances",
+        sa.Column("signal", sa.Numeric(precision=4, scale=3), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("outfit_performances", "signal")
@@ -0,0 +1,57 @@
+"""replace the style_insights active index with a partial index
+
+Revision ID: b5e2f8a4c317
+Revises: a1c7e5f3b928
+Create Date: 2026-10-16
+
+Active insights are a user's unacknowledged rows, newest first. A partial
+index on (user_id, created_at DESC) over just the unacknowledged rows returns
+them already in order without reading acknowledged insights. It takes over
+from ix_style_insights_active, which only served that query.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b5e2f8a4c317"
+down_revision: str | None = "a1c7e5f3b928"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_style_insights_user_unacknowledged",
+            "style_insights",
+            ["user_id", sa.text("created_at DESC")],
+            postgresql_where=sa.text("NOT is_acknowledged"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_style_insights_active",
+            "style_insights",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_style_insights_active",
+            "style_insights",
+            ["user_id", "is_acknowledged", "expires_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_style_insights_user_unacknowledged",
+            "style_insights",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,45 @@
+"""store image_hash as a 64-bit integer
+
+Revision ID: b3e9a7d40c52
+Revises: a8d3f6b2c710
+Create Date: 2026-10-16
+
+The pHash was stored as a 16-character hex string, so every duplicate check
+had to cast both sides to bit(64) before XOR-ing them. A bigint holds the same
+64 bits in half the space, keeps the hash indexes smaller and XORs natively.
+Hashes with the high bit set become negative, which is how the bits map onto a
+signed bigint; downgrading restores the identical hex strings.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b3e9a7d40c52"
+down_revision: str | None = "a8d3f6b2c710"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.alter_column(
+        "clothing_items",
+        "image_hash",
+        type_=sa.BigInteger(),
+        existing_type=sa.String(length=16),
+        existing_nullable=True,
+        postgresql_using="('x' || image_hash)::bit(64)::bigint",
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        "clothing_items",
+        "image_hash",
+        type_=sa.String(length=16),
+        existing_type=sa.BigInteger(),
+        existing_nullable=True,
+        postgresql_using="lpad(to_hex(image_hash), 16, '0')",
+    )
@@ -0,0 +1,106 @@
+import io
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from app.services import image_service
+from app.services.image_service import ImageService
+
+
+class FakeTurboJPEG:
+    """Stands in for TurboJPEG, reporting a fixed colorspace and recording decodes."""
+
+    def __init__(self, colorspace: int):
+        self.colorspace = colorspace
+        self.decoded = 0
+
+    def decode_header(self, data: bytes) -> tuple[int, int, int, int]:
+        return 16, 16, 0, self.colorspace
+
+    def decode(self, data: bytes, pixel_format: int) -> np.ndarray:
+        self.decoded += 1
+        return np.zeros((16, 16, 3), dtype=np.uint8)
+
+
+def jpeg_file(mode: str = "RGB", size: tuple[int, int] = (16, 16)) -> io.BytesIO:
+    buffer = io.BytesIO()
+    Image.new(mode, size).save(buffer, format="JPEG")
+    buffer.seek(0)
+    return buffer
+
+
+class TestDecodeJpeg:
+    """Tests for choosing between libjpeg-turbo and Pillow to decode uploads."""
+
+    def test_small_rgb_jpeg_uses_turbo(self, tmp_path):
+        """Test that an ordinary JPEG is decoded by libjpeg-turbo."""
+        tj = FakeTurboJPEG(colorspace=0)
+        image = ImageService(storage_path=str(tmp_path))._decode_jpeg(tj, jpeg_file())
+        assert tj.decoded == 1
+        assert image.mode == "RGB"
+
+    def test_cmyk_jpeg_uses_pillow(self, tmp_path):
+        """Test that a CMYK JPEG, which libjpeg-turbo cannot make RGB, goes to Pillow."""
+        tj = FakeTurboJPEG(colorspace=image_service.TJCS_CMYK)
+        image = ImageService(storage_path=str(tmp_path))._decode_jpeg(tj, jpeg_file("CMYK"))
+        assert tj.decoded == 0
+        assert image.mode == "CMYK"
+
+    def test_large_jpeg_uses_pillow(self, tmp_path, monkeypatch):
+        """Test that a JPEG too large to read into memory is streamed by Pillow."""
+        monkeypatch.setattr(image_service, "TURBO_DECODE_MAX_BYTES", 64)
+        tj = FakeTurboJPEG(colorspace=0)
+        image = ImageService(storage_path=str(tmp_path))._decode_jpeg(tj, jpeg_file(size=(64, 48)))
+        assert tj.decoded == 0
+        assert image.size == (64, 48)
+
+
+class TestProcessAndStore:
+    """Tests for storing uploaded images."""
+
+    @pytest.mark.asyncio
+    async def test_cmyk_jpeg_upload(self, tmp_path):
+        """Test that a CMYK JPEG is accepted and stored as RGB."""
+        buffer = io.BytesIO()
+        Image.new("CMYK", (1200, 900), (0, 255, 255, 0)).save(buffer, format="JPEG")
+        buffer.seek(0)
+
+        service = ImageService(storage_path=str(tmp_path))
+        paths = await service.process_and_store(uuid4(), buffer, "upload.jpg")
+
+        assert len(paths["image_hash"]) == 16
+        for key, size in (
+            ("image_path", (1200, 900)),
+            ("medium_path", (800, 600)),
+            ("thumbnail_path", (400, 300)),
+        ):
+            with Image.open(tmp_path / paths[key]) as stored:
+                assert stored.mode == "RGB"
+                assert stored.size == size
+                # Full magenta and yellow ink with no cyan or black comes out red
+                red, green, blue = stored.getpixel((stored.width // 2, stored.height // 2))
+                assert red > 200 and green < 60 and blue < 60
+
+
+class TestRotateImage:
+    """Tests for rotating stored images."""
+
+    @pytest.mark.asyncio
+    async def test_rotate_keeps_odd_dimensions(self, tmp_path):
+        """Test that rotating an image not sized in whole JPEG blocks does not crop it."""
+        buffer = io.BytesIO()
+        Image.new("RGB", (1203, 901), (30, 90, 200)).save(buffer, format="JPEG")
+        buffer.seek(0)
+
+        service = ImageService(storage_path=str(tmp_path))
+        paths = await service.process_and_store(uuid4(), buffer, "upload.jpg")
+
+        for direction in ("cw", "cw", "ccw"):
+            service.rotate_image(paths["image_path"], direction)
+        # One net clockwise turn swaps the sides without losing any edge pixels
+        with Image.open(tmp_path / paths["image_path"]) as rotated:
+            assert rotated.size == (901, 1203)
+        with Image.open(tmp_path / paths["thumbnail_path"]) as rotated:
+            assert rotated.size == (300, 400)
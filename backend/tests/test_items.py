@@ -2,10 +2,11 @@ from uuid import uuid4
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.item import ClothingItem, ItemStatus
-from app.services.item_service import ItemService
+from app.services.item_service import ItemService, _hash_to_int
 
 
 class TestItemList:
@@ -77,6 +78,39 @@ class TestItemList:
         assert len(data["items"]) == 5
         assert data["has_more"] is False
 
+    @pytest.mark.asyncio
+    async def test_list_items_cursor_pagination(
+        self, client: AsyncClient, test_user, auth_headers, db_session: AsyncSession
+    ):
+        """Test keyset pagination with next_cursor."""
+        for i in range(5):
+            db_session.add(
+                ClothingItem(
+                    user_id=test_user.id,
+                    type="shirt",
+                    image_path=f"test/{i}.jpg",
+                    status=ItemStatus.ready,
+                )
+            )
+        await db_session.commit()
+
+        response = await client.get("/api/v1/items", params={"page_size": 3}, headers=auth_headers)
+        data = response.json()
+        assert data["has_more"] is True
+        first_ids = [item["id"] for item in data["items"]]
+
+        response = await client.get(
+            "/api/v1/items",
+            params={"page_size": 3, "cursor": data["next_cursor"]},
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["items"]) == 2
+        assert data["has_more"] is False
+        assert data["next_cursor"] is None
+        assert not set(first_ids) & {item["id"] for item in data["items"]}
+
     @pytest.mark.asyncio
     async def test_list_items_filter_by_type(
         self, client: AsyncClient, test_user, auth_headers, db_session: AsyncSession
@@ -99,6 +133,47 @@ class TestItemList:
         assert len(data["items"]) == 2
         assert all(item["type"] == "shirt" for item in data["items"])
 
+    @pytest.mark.asyncio
+    async def test_list_items_search(
+        self, client: AsyncClient, test_user, auth_headers, db_session: AsyncSession
+    ):
+        """Test full-text search matches word prefixes and verbatim brands."""
+        for name, brand in (
+            ("Blue Oxford Shirt", None),
+            ("Graphic Tshirt", None),
+            ("Black Jeans", "H&M"),
+        ):
+            db_session.add(
+                ClothingItem(
+                    user_id=test_user.id,
+                    type="top",
+                    name=name,
+                    brand=brand,
+                    image_path=f"test/{uuid4()}.jpg",
+                    status=ItemStatus.ready,
+                )
+            )
+        await db_session.commit()
+
+        async def search(term: str) -> list[str]:
+            response = await client.get(
+                "/api/v1/items", params={"search": term}, headers=auth_headers
+            )
+            assert response.status_code == 200
+            return sorted(item["name"] for item in response.json()["items"])
+
+        # Words match from their start, so a partial word finds "Shirt" but no
+        # search word matches inside "Tshirt"
+        assert await search("shi") == ["Blue Oxford Shirt"]
+        assert await search("shirt") == ["Blue Oxford Shirt"]
+        assert await search("blue shirt") == ["Blue Oxford Shirt"]
+        # Stemming matches plurals
+        assert await search("shirts") == ["Blue Oxford Shirt"]
+        # A brand that tokenizes poorly still matches verbatim
+        assert await search("h&m") == ["Black Jeans"]
+        # Stopwords are dropped, so a search made only of them matches nothing
+        assert await search("the") == []
+
 
 class TestItemCRUD:
     """Tests for item CRUD operations."""
@@ -243,6 +318,98 @@ class TestItemArchive:
         assert data["archive_reason"] is None
 
 
+class TestItemWearAndWash:
+    """Tests for logging wears and washes."""
+
+    @staticmethod
+    async def _stored_stats(db_session: AsyncSession, item_id) -> dict:
+        # Selecting columns bypasses the identity map, so this reads what was written
+        result = await db_session.execute(
+            select(
+                ClothingItem.wear_count,
+                ClothingItem.last_worn_at,
+                ClothingItem.wears_since_wash,
+                ClothingItem.needs_wash,
+            ).where(ClothingItem.id == item_id)
+        )
+        row = result.mappings().one()
+        return {
+            "wear_count": row["wear_count"],
+            "last_worn_at": row["last_worn_at"].isoformat() if row["last_worn_at"] else None,
+            "wears_since_wash": row["wears_since_wash"],
+            "needs_wash": row["needs_wash"],
+        }
+
+    @staticmethod
+    def _response_stats(data: dict) -> dict:
+        return {
+            key: data[key]
+            for key in ("wear_count", "last_worn_at", "wears_since_wash", "needs_wash")
+        }
+
+    @pytest.mark.asyncio
+    async def test_log_wear_and_wash(
+        self, client: AsyncClient, test_user, auth_headers, db_session: AsyncSession
+    ):
+        """Test wear stats accumulate and a wash resets wash tracking."""
+        item = ClothingItem(
+            user_id=test_user.id,
+            type="shirt",  # Washed every 2 wears by default
+            image_path="test/item.jpg",
+            status=ItemStatus.ready,
+        )
+        db_session.add(item)
+        await db_session.commit()
+        await db_session.refresh(item)
+
+        response = await client.post(
+            f"/api/v1/items/{item.id}/wear",
+            json={"worn_at": "2026-03-10"},
+            headers=auth_headers,
+        )
+        assert response.status_code == 200, f"Unexpected error: {response.json()}"
+        data = response.json()
+        assert self._response_stats(data) == {
+            "wear_count": 1,
+            "last_worn_at": "2026-03-10",
+            "wears_since_wash": 1,
+            "needs_wash": False,
+        }
+        assert self._response_stats(data) == await self._stored_stats(db_session, item.id)
+
+        # An older wear still counts but does not move last_worn_at back
+        response = await client.post(
+            f"/api/v1/items/{item.id}/wear",
+            json={"worn_at": "2026-03-01"},
+            headers=auth_headers,
+        )
+        assert response.status_code == 200, f"Unexpected error: {response.json()}"
+        data = response.json()
+        assert self._response_stats(data) == {
+            "wear_count": 2,
+            "last_worn_at": "2026-03-10",
+            "wears_since_wash": 2,
+            "needs_wash": True,
+        }
+        assert self._response_stats(data) == await self._stored_stats(db_session, item.id)
+
+        response = await client.post(
+            f"/api/v1/items/{item.id}/wash",
+            json={"washed_at": "2026-03-11"},
+            headers=auth_headers,
+        )
+        assert response.status_code == 200, f"Unexpected error: {response.json()}"
+        data = response.json()
+        assert data["last_washed_at"] == "2026-03-11"
+        assert self._response_stats(data) == {
+            "wear_count": 2,
+            "last_worn_at": "2026-03-10",
+            "wears_since_wash": 0,
+            "needs_wash": False,
+        }
+        assert self._response_stats(data) == await self._stored_stats(db_session, item.id)
+
+
 class TestItemService:
     """Tests for ItemService business logic."""
 
@@ -296,3 +463,67 @@ class TestItemService:
         # Black should be most common
         assert color_dist[0]["color"] == "black"
         assert color_dist[0]["count"] == 3
+
+    @pytest.mark.asyncio
+    async def test_counts_follow_archive_and_edits(self, db_session: AsyncSession, test_user):
+        """Test type and color counts track archiving and edits."""
+        items = [
+            ClothingItem(
+                user_id=test_user.id,
+                type="shirt",
+                image_path=f"test/{uuid4()}.jpg",
+                colors=["black", "white"],
+                status=ItemStatus.ready,
+            )
+            for _ in range(2)
+        ]
+        db_session.add_all(items)
+        await db_session.commit()
+
+        service = ItemService(db_session)
+        await service.archive_by_id(items[0].id, test_user.id)
+        items[1].type = "jacket"
+        items[1].colors = ["white"]
+        await db_session.commit()
+
+        assert await service.get_item_types(test_user.id) == [{"type": "jacket", "count": 1}]
+        assert await service.get_color_distribution(test_user.id) == [
+            {"color": "white", "count": 1}
+        ]
+
+    @pytest.mark.asyncio
+    async def test_find_duplicate_by_hash(self, db_session: AsyncSession, test_user):
+        """Test exact and near-duplicate hashes match and distinct hashes do not."""
+        stored = "8f3a5c7e9b1d2f40"
+        item = ClothingItem(
+            user_id=test_user.id,
+            type="shirt",
+            image_path=f"test/{uuid4()}.jpg",
+            image_hash=_hash_to_int(stored),
+            status=ItemStatus.ready,
+        )
+        db_session.add(item)
+        await db_session.commit()
+
+        service = ItemService(db_session)
+        for image_hash, is_duplicate in (
+            (stored, True),
+            ("8f3a5c7e9b1d2f41", True),  # 1 bit apart
+            ("0f3a5c7e9b1d2f42", True),  # 2 bits apart, one of them the sign bit
+            ("8f3a5c7e9b1d2f47", False),  # 3 bits apart
+            ("70c5a38164e2d0bf", False),  # every bit different
+        ):
+            found = await service.find_duplicate_by_hash(test_user.id, image_hash)
+            assert (found.id if found else None) == (item.id if is_duplicate else None)
+            assert await service.duplicate_exists(test_user.id, image_hash) is is_duplicate
+
+        # threshold=0 only matches the exact hash
+        assert (
+            await service.duplicate_exists(test_user.id, "8f3a5c7e9b1d2f41", threshold=0) is False
+        )
+        assert await service.duplicate_exists(test_user.id, stored, threshold=0) is True
+
+        # Archived items are not duplicates
+        await service.archive_by_id(item.id, test_user.id)
+        assert await service.find_duplicate_by_hash(test_user.id, stored) is None
+        assert await service.duplicate_exists(test_user.id, stored) is False
@@ -0,0 +1,115 @@
+from datetime import date
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.item import ClothingItem, ItemStatus
+from app.models.learning import UserLearningProfile
+from app.models.outfit import Outfit, OutfitItem, OutfitStatus
+from app.services.learning_service import LearningService
+
+
+async def create_outfit(db_session: AsyncSession, user_id, colors: list[str]) -> Outfit:
+    """Create a pending outfit with one item per color."""
+    outfit = Outfit(
+        user_id=user_id,
+        occasion="casual",
+        scheduled_for=date.today(),
+        status=OutfitStatus.pending,
+    )
+    db_session.add(outfit)
+    for position, color in enumerate(colors):
+        item = ClothingItem(
+            user_id=user_id,
+            type="shirt",
+            image_path=f"test/{color}.jpg",
+            primary_color=color,
+            style=["casual"],
+            status=ItemStatus.ready,
+        )
+        db_session.add(item)
+        await db_session.flush()
+        db_session.add(OutfitItem(outfit_id=outfit.id, item_id=item.id, position=position))
+    await db_session.commit()
+    return outfit
+
+
+async def get_totals(db_session: AsyncSession, user_id) -> dict:
+    result = await db_session.execute(
+        select(UserLearningProfile.learning_totals).where(UserLearningProfile.user_id == user_id)
+    )
+    return result.scalar_one()
+
+
+def counts(totals: dict) -> dict:
+    """The integer counts of learning totals, which must match exactly."""
+    return {
+        "outfits": totals["outfits"],
+        "accepted": totals["accepted"],
+        "rating_count": totals["rating_count"],
+        "colors": {color: data["count"] for color, data in totals["colors"].items()},
+        "styles": {style: data["count"] for style, data in totals["styles"].items()},
+        "occasions": {
+            occasion: (data["count"], data["positive"])
+            for occasion, data in totals["occasions"].items()
+        },
+    }
+
+
+class TestIncrementalLearning:
+    """Tests for incremental learning profile updates on feedback."""
+
+    @pytest.mark.asyncio
+    async def test_feedback_on_new_outfit_matches_recompute(
+        self, client: AsyncClient, test_user, auth_headers, db_session: AsyncSession
+    ):
+        """Test that first-time feedback adds the outfit exactly as a recompute would."""
+        counted = await create_outfit(db_session, test_user.id, ["blue"])
+        response = await client.post(f"/api/v1/outfits/{counted.id}/accept", headers=auth_headers)
+        assert response.status_code == 200
+        await LearningService(db_session).recompute_learning_profile(test_user.id)
+
+        new = await create_outfit(db_session, test_user.id, ["blue", "red"])
+        response = await client.post(
+            f"/api/v1/outfits/{new.id}/feedback",
+            json={"accepted": True, "rating": 5},
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+
+        incremental = await get_totals(db_session, test_user.id)
+        assert incremental["outfits"] == 2
+
+        await LearningService(db_session).recompute_learning_profile(test_user.id)
+        assert counts(incremental) == counts(await get_totals(db_session, test_user.id))
+
+    @pytest.mark.asyncio
+    async def test_feedback_after_accept_is_not_counted_twice(
+        self, client: AsyncClient, test_user, auth_headers, db_session: AsyncSession
+    ):
+        """Test feedback on an outfit the last recompute already counted."""
+        first = await create_outfit(db_session, test_user.id, ["blue"])
+        second = await create_outfit(db_session, test_user.id, ["green"])
+        for outfit in (first, second):
+            response = await client.post(
+                f"/api/v1/outfits/{outfit.id}/accept", headers=auth_headers
+            )
+            assert response.status_code == 200
+        await LearningService(db_session).recompute_learning_profile(test_user.id)
+
+        response = await client.post(
+            f"/api/v1/outfits/{first.id}/feedback",
+            json={"accepted": True, "rating": 4},
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+
+        after_feedback = await get_totals(db_session, test_user.id)
+        assert after_feedback["outfits"] == 2
+        assert after_feedback["accepted"] == 2
+        assert after_feedback["colors"]["blue"]["count"] == 1
+
+        await LearningService(db_session).recompute_learning_profile(test_user.id)
+        assert counts(after_feedback) == counts(await get_totals(db_session, test_user.id))
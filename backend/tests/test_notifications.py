@@ -1,7 +1,25 @@
+from datetime import date
+from types import SimpleNamespace
+
+import httpx
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.notification import NotificationSettings
+from app.models.notification import Notification, NotificationSettings, NotificationStatus
+from app.models.outfit import Outfit
+from app.schemas.notification import EmailConfig, NtfyConfig
+from app.services import notification_providers
+from app.services.notification_providers import (
+    EmailMessage,
+    EmailProvider,
+    NtfyNotification,
+    NtfyProvider,
+    close_provider_clients,
+    open_provider_clients,
+)
+from app.services.notification_service import DeliveryStatus, NotificationDispatcher
 
 
 class TestNotificationSettings:
@@ -57,6 +75,50 @@ class TestNotificationSettings:
             data = response.json()
             assert data["channel"] == "email"
 
+    @pytest.mark.asyncio
+    async def test_create_duplicate_channel(self, client: AsyncClient, test_user, auth_headers):
+        """Test that configuring the same channel twice is rejected."""
+        payload = {
+            "channel": "ntfy",
+            "config": {"server": "https://ntfy.sh", "topic": "duplicate-test"},
+            "enabled": True,
+            "priority": 1,
+        }
+        response = await client.post(
+            "/api/v1/notifications/settings", json=payload, headers=auth_headers
+        )
+        assert response.status_code == 201
+
+        response = await client.post(
+            "/api/v1/notifications/settings", json=payload, headers=auth_headers
+        )
+        assert response.status_code == 400
+
+        response = await client.get("/api/v1/notifications/settings", headers=auth_headers)
+        assert [s["channel"] for s in response.json()] == ["ntfy"]
+
+    @pytest.mark.asyncio
+    async def test_register_push_token_twice(self, client: AsyncClient, test_user, auth_headers):
+        """Test that registering a new push token updates the existing setting."""
+        response = await client.post(
+            "/api/v1/notifications/push-token",
+            json={"push_token": "ExponentPushToken[first]"},
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+        first = response.json()
+
+        response = await client.post(
+            "/api/v1/notifications/push-token",
+            json={"push_token": "ExponentPushToken[second]"},
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+        second = response.json()
+        assert second["id"] == first["id"]
+        assert second["config"] == {"push_token": "ExponentPushToken[second]"}
+        assert second["enabled"] is True
+
     @pytest.mark.asyncio
     async def test_update_setting(self, client: AsyncClient, test_user, auth_headers, db_session):
         """Test updating a notification setting."""
@@ -164,3 +226,205 @@ class TestNotificationDefaults:
         # Should have server and token fields (may be empty)
         assert "server" in data
         assert "token" in data
+
+
+class TestNotificationRetry:
+    """Tests for retrying failed notifications in a batch."""
+
+    @pytest.mark.asyncio
+    async def test_retry_notifications_results_in_order(
+        self, test_user, db_session: AsyncSession, monkeypatch
+    ):
+        """Test that each notification is yielded with its own result, in order."""
+        sent_topics = []
+
+        async def fake_send(self, notification):
+            sent_topics.append(self.topic)
+            return {"success": True}
+
+        monkeypatch.setattr(NtfyProvider, "send", fake_send)
+
+        db_session.add(
+            NotificationSettings(
+                user_id=test_user.id,
+                channel="ntfy",
+                config={"server": "https://ntfy.sh", "topic": "retry-test"},
+                enabled=True,
+            )
+        )
+        outfit = Outfit(
+            user_id=test_user.id,
+            occasion="casual",
+            scheduled_for=date.today(),
+        )
+        db_session.add(outfit)
+        await db_session.flush()
+
+        notifications = [
+            Notification(
+                user_id=test_user.id,
+                outfit_id=outfit_id,
+                channel=channel,
+                status=NotificationStatus.retrying,
+                attempts=1,
+                payload={},
+            )
+            for outfit_id, channel in (
+                (outfit.id, "ntfy"),
+                (outfit.id, "mattermost"),
+                (None, "ntfy"),
+                (outfit.id, "ntfy"),
+            )
+        ]
+        db_session.add_all(notifications)
+        await db_session.commit()
+
+        dispatcher = NotificationDispatcher(db_session, "http://test")
+        pairs = [pair async for pair in dispatcher.retry_notifications(notifications)]
+
+        assert [notification for notification, _ in pairs] == notifications
+        results = [result for _, result in pairs]
+        assert [result.status for result in results] == [
+            DeliveryStatus.SENT,
+            DeliveryStatus.FAILED,
+            DeliveryStatus.FAILED,
+            DeliveryStatus.SENT,
+        ]
+        assert results[1].channel == "mattermost"
+        assert results[1].error == "Channel mattermost not configured or disabled"
+        assert results[2].error == "Outfit not found"
+        assert sent_topics == ["retry-test", "retry-test"]
+
+    @pytest.mark.asyncio
+    async def test_retry_skips_notification_attempted_elsewhere(
+        self, test_user, db_session: AsyncSession
+    ):
+        """Test that a notification another run attempted since it was read is skipped."""
+        notification = Notification(
+            user_id=test_user.id,
+            channel="ntfy",
+            status=NotificationStatus.retrying,
+            attempts=1,
+            payload={},
+        )
+        db_session.add(notification)
+        await db_session.commit()
+
+        # Another retry run bumps the attempt counter after this one read the row
+        await db_session.execute(
+            update(Notification)
+            .where(Notification.id == notification.id)
+            .values(attempts=2)
+            .execution_options(synchronize_session=False)
+        )
+        await db_session.commit()
+
+        dispatcher = NotificationDispatcher(db_session, "http://test")
+        assert await dispatcher.retry_notification(notification) is None
+
+
+class FakeSMTP:
+    """Stands in for aiosmtplib.SMTP, recording connections and sends."""
+
+    connects = 0
+    sent: list[str] = []
+
+    def __init__(self, **kwargs):
+        self.is_connected = False
+
+    async def connect(self):
+        FakeSMTP.connects += 1
+        self.is_connected = True
+
+    async def sendmail(self, sender, recipients, data):
+        FakeSMTP.sent.extend(recipients)
+
+    async def quit(self):
+        self.is_connected = False
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.quit()
+
+
+class TestProviderClients:
+    """Tests for the provider clients shared across sends."""
+
+    @pytest.fixture
+    def ntfy_requests(self, monkeypatch) -> list[httpx.Request]:
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, json={"id": str(len(requests))})
+
+        real_client = httpx.AsyncClient
+        monkeypatch.setattr(
+            httpx,
+            "AsyncClient",
+            lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs),
+        )
+        return requests
+
+    @pytest.fixture
+    def fake_smtp(self, monkeypatch) -> type[FakeSMTP]:
+        monkeypatch.setattr(FakeSMTP, "connects", 0)
+        monkeypatch.setattr(FakeSMTP, "sent", [])
+        monkeypatch.setattr(
+            notification_providers,
+            "aiosmtplib",
+            SimpleNamespace(
+                SMTP=FakeSMTP,
+                SMTPException=Exception,
+                SMTPServerDisconnected=ConnectionError,
+            ),
+        )
+        monkeypatch.setenv("SMTP_HOST", "smtp.test")
+        monkeypatch.setenv("SMTP_USER", "wardrowbe@test")
+        return FakeSMTP
+
+    @staticmethod
+    async def _send_twice(ntfy: NtfyProvider, email: EmailProvider) -> None:
+        for i in range(2):
+            result = await ntfy.send(
+                NtfyNotification(topic="clients-test", title="Test", message=f"Send {i}")
+            )
+            assert result == {"success": True, "response": {"id": str(i + 1)}}
+            result = await email.send(
+                EmailMessage(to="user@example.com", subject="Test", html_body=f"<p>Send {i}</p>")
+            )
+            assert result == {"success": True}
+
+    @pytest.mark.asyncio
+    async def test_send_twice_with_open_clients(self, ntfy_requests, fake_smtp):
+        """Test that sends reuse the clients opened for the running loop."""
+        ntfy = NtfyProvider(NtfyConfig(server="https://ntfy.test", topic="clients-test"))
+        email = EmailProvider(EmailConfig(address="user@example.com"))
+
+        await open_provider_clients()
+        try:
+            await self._send_twice(ntfy, email)
+        finally:
+            await close_provider_clients()
+
+        assert len(ntfy_requests) == 2
+        # Both emails went over the one reused SMTP connection
+        assert fake_smtp.connects == 1
+        assert fake_smtp.sent == ["user@example.com", "user@example.com"]
+        assert notification_providers._http_client is None
+        assert notification_providers._smtp_lock is None
+
+    @pytest.mark.asyncio
+    async def test_send_twice_without_open_clients(self, ntfy_requests, fake_smtp):
+        """Test that sends outside the app and worker lifespans use one-off connections."""
+        ntfy = NtfyProvider(NtfyConfig(server="https://ntfy.test", topic="clients-test"))
+        email = EmailProvider(EmailConfig(address="user@example.com"))
+
+        await self._send_twice(ntfy, email)
+
+        assert len(ntfy_requests) == 2
+        assert fake_smtp.connects == 2
+        assert fake_smtp.sent == ["user@example.com", "user@example.com"]